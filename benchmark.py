@@ -0,0 +1,180 @@
+from typing import List
+import click
+import json
+import random
+import time
+
+import numpy as np
+
+from registrable import import_submodules
+from reversi.board import Color, ReversiBoard
+from reversi.board.bit_board import BitBoard, BatchBitBoard
+from reversi.board.bit_board.flips import get_reversed_places, get_reversed_places_by_shifting
+from reversi.players.search_players.search_player import ReversiSearchNode
+from search_algorithm import SearchAlgorithm
+from search_algorithm.root_splitting_search import RootSplittingSearch
+
+
+def collect_random_moves(num_games: int):
+    """Collect (player_places, opponent_places, position_index) for every legal move in random games."""
+    moves = []
+    board = BitBoard()
+    for _ in range(num_games):
+        board.reset()
+        color = Color.BLACK
+        while True:
+            legal_positions = board.get_legal_positions(color)
+            if len(legal_positions) == 0:
+                color = color.opponent
+                legal_positions = board.get_legal_positions(color)
+                if len(legal_positions) == 0:
+                    break
+            for position in legal_positions:
+                position_bits = board._position_to_bits(position)
+                moves.append((board.board[color], board.board[color.opponent], position_bits.bit_length() - 1))
+            board.place(random.choice(legal_positions), color)
+            color = color.opponent
+    return moves
+
+
+@click.group()
+def benchmark():
+    pass
+
+
+@benchmark.command()
+@click.option("--num-games", type=int, default=100)
+@click.option("--seed", type=int, default=0)
+def flips(num_games: int, seed: int):
+    random.seed(seed)
+    moves = collect_random_moves(num_games)
+
+    start_time = time.perf_counter()
+    for player_places, opponent_places, position_index in moves:
+        get_reversed_places_by_shifting(player_places, opponent_places, 1 << position_index)
+    shifting_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for player_places, opponent_places, position_index in moves:
+        get_reversed_places(player_places, opponent_places, position_index)
+    table_time = time.perf_counter() - start_time
+
+    print(f"Number of moves: {len(moves)}")
+    print(f"Shift-based: {len(moves) / shifting_time:.0f} flips/sec")
+    print(f"Table-driven: {len(moves) / table_time:.0f} flips/sec")
+
+
+@benchmark.command()
+@click.option("--num-boards", type=int, default=10000)
+@click.option("--seed", type=int, default=0)
+def batch_playouts(num_boards: int, seed: int):
+    rng = np.random.default_rng(seed)
+    batch_board = BatchBitBoard(num_boards)
+
+    start_time = time.perf_counter()
+    num_moves = 0
+    while not batch_board.is_terminal().all():
+        moves = batch_board.get_random_moves(rng)
+        num_moves += int((moves != 0).sum())
+        batch_board.make_moves(moves)
+    elapsed_time = time.perf_counter() - start_time
+
+    print(f"Playouts: {num_boards / elapsed_time:.0f} games/sec")
+    print(f"Moves: {num_moves / elapsed_time:.0f} moves/sec")
+
+
+def play_random_moves(board: ReversiBoard, num_moves: int) -> Color:
+    """Play random moves from the current state of the board and return the color to move."""
+    color = Color.BLACK
+    for _ in range(num_moves):
+        legal_positions = board.get_legal_positions(color)
+        if len(legal_positions) == 0:
+            color = color.opponent
+            legal_positions = board.get_legal_positions(color)
+        board.place(random.choice(legal_positions), color)
+        color = color.opponent
+    return color
+
+
+@benchmark.command()
+@click.argument("search-configs", type=str, nargs=-1)
+@click.option("--depth", type=int, default=5)
+@click.option("--num-positions", type=int, default=10)
+@click.option("--num-random-moves", type=int, default=20)
+@click.option("--seed", type=int, default=0)
+def search_nodes(search_configs: List[str], depth: int, num_positions: int, num_random_moves: int, seed: int):
+    """
+    Compare the number of searched nodes and the time of search algorithms at a fixed depth.
+    Each of SEARCH_CONFIGS is a JSON string of a search algorithm config, which gets `max_depth` set to `--depth`.
+    """
+    import_submodules("reversi")
+    import_submodules("search_algorithm")
+
+    for search_config in search_configs:
+        random.seed(seed)
+        num_searched_nodes = 0
+        elapsed_time = 0.0
+        for _ in range(num_positions):
+            board = BitBoard()
+            color = play_random_moves(board, num_random_moves)
+
+            search_algorithm = SearchAlgorithm.from_params(dict(json.loads(search_config), max_depth=depth))
+            node = ReversiSearchNode(board, current_color=color, playing_color=color)
+            start_time = time.perf_counter()
+            search_algorithm.search_best_action(node)
+            elapsed_time += time.perf_counter() - start_time
+            num_searched_nodes += search_algorithm.num_searched_nodes
+
+        print(search_config)
+        print(f"    Searched nodes: {num_searched_nodes}, Time: {elapsed_time:.2f} sec")
+
+
+@benchmark.command()
+@click.argument("search-config", type=str)
+@click.option("--num-workers", type=int, multiple=True, default=[1, 2, 4])
+@click.option("--max-time", type=float, default=1.0)
+@click.option("--num-positions", type=int, default=10)
+@click.option("--num-random-moves", type=int, default=20)
+@click.option("--seed", type=int, default=0)
+def parallel_search(
+    search_config: str, num_workers: List[int], max_time: float, num_positions: int, num_random_moves: int, seed: int
+):
+    """
+    Compare the single-process search of SEARCH_CONFIG (a JSON string of a "min_max" config)
+    with the root splitting search on different numbers of workers at equal time.
+    """
+    import_submodules("reversi")
+    import_submodules("search_algorithm")
+
+    def build_search_algorithms():
+        yield "single process", SearchAlgorithm.from_params(dict(json.loads(search_config), max_time=max_time))
+        for n in num_workers:
+            inner_search_algorithm = SearchAlgorithm.from_params(dict(json.loads(search_config), max_time=max_time))
+            yield f"{n} workers", RootSplittingSearch(inner_search_algorithm, num_workers=n)
+
+    for name, search_algorithm in build_search_algorithms():
+        random.seed(seed)
+        num_searched_nodes = 0
+        depths = []
+        elapsed_time = 0.0
+        for _ in range(num_positions):
+            board = BitBoard()
+            color = play_random_moves(board, num_random_moves)
+            node = ReversiSearchNode(board, current_color=color, playing_color=color)
+            start_time = time.perf_counter()
+            search_algorithm.search_best_action(node)
+            elapsed_time += time.perf_counter() - start_time
+            num_searched_nodes += search_algorithm.num_searched_nodes
+            depths.append(search_algorithm.iterations[-1].depth if search_algorithm.iterations else 0)
+        if isinstance(search_algorithm, RootSplittingSearch):
+            search_algorithm.close()
+
+        print(name)
+        print(
+            f"    Searched nodes: {num_searched_nodes} ({num_searched_nodes / elapsed_time:.0f} nodes/sec), "
+            f"Average completed depth: {np.mean(depths):.2f}"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
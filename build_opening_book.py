@@ -0,0 +1,23 @@
+import click
+import glob
+
+from reversi.players.opening_book import build_opening_book
+import logging
+
+logging.basicConfig(format="%(asctime)s - %(levelname)s - %(name)s - %(message)s", level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@click.command()
+@click.argument("wtb-file-pattern", type=str)
+@click.argument("output-path", type=str)
+@click.option("--max-num-moves", type=int, default=20)
+def main(wtb_file_pattern: str, output_path: str, max_num_moves: int):
+    """Build an opening book from the WTHOR files matching the pattern, e.g., "data/*.wtb"."""
+    file_paths = sorted(glob.glob(wtb_file_pattern))
+    num_records = build_opening_book(file_paths, output_path, max_num_moves=max_num_moves)
+    logger.info(f"Wrote {num_records} moves from {len(file_paths)} files to {output_path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,15 @@
+from typing import Dict, List
 import click
 import json
 import tqdm
-from collections import Counter
+from collections import Counter, defaultdict
 
 
 from registrable import import_submodules
 from reversi.players import Player
 from reversi.board import ReversiBoard, Color
 from reversi.game_engine import ReversiGameEngine
+from search_algorithm.search_statistics import JsonLinesStatisticsWriter, SearchStatistics
 
 
 def load_player(player_signature: str, color: Color) -> Player:
@@ -19,31 +21,71 @@ def load_player(player_signature: str, color: Color) -> Player:
     return player
 
 
+def summarize_statistics(statistics_list: List[SearchStatistics]) -> Dict[str, float]:
+    total_time = sum(statistics.elapsed_time for statistics in statistics_list)
+    branching_factors = [
+        statistics.effective_branching_factor
+        for statistics in statistics_list
+        if statistics.effective_branching_factor is not None
+    ]
+    return {
+        "num_searches": len(statistics_list),
+        "time_per_search": total_time / len(statistics_list),
+        "max_time_per_search": max(statistics.elapsed_time for statistics in statistics_list),
+        "nodes_per_second": sum(statistics.num_searched_nodes for statistics in statistics_list) / total_time,
+        "playouts_per_second": sum(statistics.num_playouts for statistics in statistics_list) / total_time,
+        "depth": sum(len(statistics.iterations) for statistics in statistics_list) / len(statistics_list),
+        "effective_branching_factor": sum(branching_factors) / len(branching_factors) if branching_factors else None,
+    }
+
+
 @click.command()
 @click.argument("black-player", type=str)
 @click.argument("white-player", type=str)
 @click.option("--board-type", type=str, default="bit")
 @click.option("--num-games", type=int, default=100)
-def play(black_player: str, white_player: str, board_type: str, num_games: int):
+@click.option("--statistics-path", type=str, default=None, help="JSON lines file to append the search statistics to.")
+def play(black_player: str, white_player: str, board_type: str, num_games: int, statistics_path: str):
     import_submodules("reversi")
     import_submodules("search_algorithm")
 
     counter = Counter()
 
     players = {Color.BLACK: load_player(black_player, Color.BLACK), Color.WHITE: load_player(white_player, Color.WHITE)}
+    player_signatures = {Color.BLACK: black_player, Color.WHITE: white_player}
     game_engine = ReversiGameEngine(ReversiBoard.by_name(board_type)())
+    statistics_writer = None if statistics_path is None else JsonLinesStatisticsWriter(statistics_path)
+    statistics_lists: Dict[Color, List[SearchStatistics]] = defaultdict(list)
 
-    for _ in tqdm.tqdm(range(num_games)):
+    for game_index in tqdm.tqdm(range(num_games)):
         game_engine.reset()
         is_terminal = False
         while not is_terminal:
-            legal_positions = game_engine.board.get_legal_positions(game_engine.current_color)
-            position = players[game_engine.current_color].choose_position(game_engine.board, legal_positions)
+            color = game_engine.current_color
+            legal_positions = game_engine.board.get_legal_positions(color)
+            position = players[color].choose_position(game_engine.board, legal_positions)
+            # only search players report statistics
+            statistics = getattr(players[color], "last_search_statistics", None)
+            if statistics is not None:
+                statistics_lists[color].append(statistics)
+                if statistics_writer is not None:
+                    statistics_writer.write(
+                        statistics,
+                        game=game_index,
+                        color=color.name,
+                        player=player_signatures[color],
+                        num_disks=sum(game_engine.board.get_num_disks(c) for c in Color),
+                    )
             is_terminal = game_engine.execute_move(position)
         result = game_engine.summarize_result()
         counter[result.winner] += 1
     print(counter)
 
+    for color, statistics_list in statistics_lists.items():
+        print(f"{color.name} ({player_signatures[color]}): {summarize_statistics(statistics_list)}")
+    if statistics_writer is not None:
+        statistics_writer.close()
+
 
 if __name__ == "__main__":
     play()
@@ -0,0 +1 @@
+from .board import ArrayBoard
@@ -0,0 +1,123 @@
+from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+
+import numpy as np
+
+from reversi.board.color import Color
+from reversi.board.position import Position
+from reversi.board.board import ReversiBoard
+from reversi.board.exceptions import InvalidPositionError
+from reversi.board.zobrist import get_disk_keys
+
+EMPTY = 0
+COLOR_TO_VALUE: Dict[Color, int] = {Color.BLACK: 1, Color.WHITE: -1}
+VALUE_TO_COLOR: Dict[int, Optional[Color]] = {EMPTY: None, 1: Color.BLACK, -1: Color.WHITE}
+
+# (placed square index, color, flipped square indices)
+ArrayUndoToken = Tuple[int, Color, np.ndarray]
+
+
+@lru_cache(maxsize=None)
+def get_ray_indices(size: int) -> np.ndarray:
+    """
+    Return an array of shape (size * size, 8, size - 1) holding the square indices on the rays
+    from every square toward the 8 directions.
+    Rays shorter than `size - 1` are padded with `size * size`, the index of a sentinel cell that is always empty.
+    """
+    num_squares = size * size
+    ray_indices = np.full((num_squares, 8, size - 1), num_squares, dtype=np.int64)
+    directions = [(x, y) for x in [-1, 0, 1] for y in [-1, 0, 1] if not x == y == 0]
+    for x in range(size):
+        for y in range(size):
+            for direction_index, (x_offset, y_offset) in enumerate(directions):
+                ray_x, ray_y = x + x_offset, y + y_offset
+                step = 0
+                while 0 <= ray_x < size and 0 <= ray_y < size:
+                    ray_indices[x * size + y, direction_index, step] = ray_x * size + ray_y
+                    ray_x, ray_y = ray_x + x_offset, ray_y + y_offset
+                    step += 1
+    return ray_indices
+
+
+@ReversiBoard.register("array")
+class ArrayBoard(ReversiBoard):
+    """
+    Board of arbitrary size backed by a flat int8 array (+1 for black, -1 for white, 0 for empty).
+    Legal moves and flips are computed by array operations over the precomputed rays.
+    """
+
+    def __init__(self, size: int = 8):
+        super().__init__(size=size)
+        self.ray_indices = get_ray_indices(size)
+        self.disk_keys = get_disk_keys(size)
+
+        # the last cell is the sentinel for padded rays
+        self.cells = np.zeros(size * size + 1, dtype=np.int8)
+
+        self.reset()
+
+    def get_color(self, position: Position) -> Optional[Color]:
+        return VALUE_TO_COLOR[int(self.cells[position.to_index(self.size)])]
+
+    def _get_bounded_lengths(self, ray_values: np.ndarray, player_value: int) -> np.ndarray:
+        """
+        Return the number of opponent disks bounded by a player disk on each ray.
+        `ray_values` has the rays on the last axis.
+        """
+        is_not_opponent = ray_values != -player_value
+        # index of the first square that is not occupied by the opponent
+        first_not_opponent = np.argmax(is_not_opponent, axis=-1)
+        is_bounded = np.take_along_axis(ray_values, first_not_opponent[..., None], axis=-1)[..., 0] == player_value
+        return np.where(is_bounded, first_not_opponent, 0)
+
+    def get_legal_positions(self, color: Color) -> List[Position]:
+        bounded_lengths = self._get_bounded_lengths(self.cells[self.ray_indices], COLOR_TO_VALUE[color])
+        is_legal = (self.cells[:-1] == EMPTY) & (bounded_lengths > 0).any(axis=-1)
+        return [Position.from_index(int(index), self.size) for index in np.flatnonzero(is_legal)]
+
+    def _place(self, position: Position, color: Color) -> ArrayUndoToken:
+        square_index = position.to_index(self.size)
+        player_value = COLOR_TO_VALUE[color]
+
+        ray_indices = self.ray_indices[square_index]
+        bounded_lengths = self._get_bounded_lengths(self.cells[ray_indices], player_value)
+        is_flipped = np.arange(self.size - 1) < bounded_lengths[:, None]
+        flipped_indices = ray_indices[is_flipped]
+
+        if len(flipped_indices) == 0:
+            raise InvalidPositionError(position)
+
+        self.cells[flipped_indices] = player_value
+        self.cells[square_index] = player_value
+
+        disk_keys = self.disk_keys
+        hash_key = self.hash_key ^ disk_keys[color][square_index]
+        for flipped_index in flipped_indices.tolist():
+            hash_key ^= disk_keys[Color.BLACK][flipped_index] ^ disk_keys[Color.WHITE][flipped_index]
+        self.hash_key = hash_key
+
+        return square_index, color, flipped_indices
+
+    def unmake_move(self, undo_token: ArrayUndoToken):
+        square_index, color, flipped_indices = undo_token
+        self.cells[flipped_indices] = COLOR_TO_VALUE[color.opponent]
+        self.cells[square_index] = EMPTY
+
+        disk_keys = self.disk_keys
+        hash_key = self.hash_key ^ disk_keys[color][square_index]
+        for flipped_index in flipped_indices.tolist():
+            hash_key ^= disk_keys[Color.BLACK][flipped_index] ^ disk_keys[Color.WHITE][flipped_index]
+        self.hash_key = hash_key
+
+    def get_num_disks(self, color: Color) -> int:
+        return int(np.count_nonzero(self.cells == COLOR_TO_VALUE[color]))
+
+    def reset(self):
+        self.cells[:] = EMPTY
+
+        center = self.size // 2
+        self.cells[Position.at(center - 1, center - 1).to_index(self.size)] = COLOR_TO_VALUE[Color.WHITE]
+        self.cells[Position.at(center, center).to_index(self.size)] = COLOR_TO_VALUE[Color.WHITE]
+        self.cells[Position.at(center - 1, center).to_index(self.size)] = COLOR_TO_VALUE[Color.BLACK]
+        self.cells[Position.at(center, center - 1).to_index(self.size)] = COLOR_TO_VALUE[Color.BLACK]
+        self.hash_key = self._compute_hash_key()
@@ -1 +1,3 @@
 from .board import BitBoard
+from .state import BitBoardState
+from .batch_board import BatchBitBoard
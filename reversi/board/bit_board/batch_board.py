@@ -0,0 +1,124 @@
+from typing import List
+
+import numpy as np
+
+from reversi.board.color import Color
+from .state import BitBoardState
+
+UINT64 = np.uint64
+
+# (shift, mask of the opponent disks that can be jumped over) for the 8 directions, same as the 8x8 `BitBoard`
+DIRECTIONS = [
+    (UINT64(1), UINT64(0x7E7E7E7E7E7E7E7E)),
+    (UINT64(8), UINT64(0x00FFFFFFFFFFFF00)),
+    (UINT64(7), UINT64(0x007E7E7E7E7E7E00)),
+    (UINT64(9), UINT64(0x007E7E7E7E7E7E00)),
+]
+
+INITIAL_BLACK = 0x0000000810000000
+INITIAL_WHITE = 0x0000001008000000
+
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """Count the set bits of each element of an uint64 array."""
+    return _BYTE_POPCOUNT[bits.reshape(-1, 1).view(np.uint8)].sum(axis=1, dtype=np.int64).reshape(bits.shape)
+
+
+def lowest_bit(bits: np.ndarray) -> np.ndarray:
+    return bits & (~bits + UINT64(1))
+
+
+def _shift(bits: np.ndarray, shift: UINT64, to_left: bool) -> np.ndarray:
+    return bits << shift if to_left else bits >> shift
+
+
+class BatchBitBoard:
+    """
+    N standard-size bit boards held as uint64 arrays and processed by vectorized operations.
+    Each board is stored relative to the color to move, i.e., `player` is the disks of the color to move.
+    """
+
+    def __init__(self, num_boards: int):
+        self.player = np.full(num_boards, INITIAL_BLACK, dtype=UINT64)
+        self.opponent = np.full(num_boards, INITIAL_WHITE, dtype=UINT64)
+        self.is_black_to_move = np.ones(num_boards, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.player)
+
+    @classmethod
+    def from_states(cls, states: List[BitBoardState]) -> "BatchBitBoard":
+        batch_board = cls(len(states))
+        batch_board.player = np.array([state.player for state in states], dtype=UINT64)
+        batch_board.opponent = np.array([state.opponent for state in states], dtype=UINT64)
+        batch_board.is_black_to_move = np.array([state.color == Color.BLACK for state in states], dtype=bool)
+        return batch_board
+
+    def to_states(self) -> List[BitBoardState]:
+        return [
+            BitBoardState(int(player), int(opponent), Color.BLACK if is_black else Color.WHITE)
+            for player, opponent, is_black in zip(self.player, self.opponent, self.is_black_to_move)
+        ]
+
+    @staticmethod
+    def _get_legal_masks(player: np.ndarray, opponent: np.ndarray) -> np.ndarray:
+        blank = ~(player | opponent)
+        legal = np.zeros_like(player)
+        for shift, mask in DIRECTIONS:
+            masked_opponent = opponent & mask
+            for to_left in [True, False]:
+                tmp = masked_opponent & _shift(player, shift, to_left)
+                for _ in range(5):
+                    tmp |= masked_opponent & _shift(tmp, shift, to_left)
+                legal |= blank & _shift(tmp, shift, to_left)
+        return legal
+
+    def get_legal_masks(self) -> np.ndarray:
+        """Return the legal moves of the color to move as bit masks."""
+        return self._get_legal_masks(self.player, self.opponent)
+
+    def get_reversed_places(self, moves: np.ndarray) -> np.ndarray:
+        """Return the disks flipped by `moves`, an array of single-bit masks (0 for no move)."""
+        reversed_places = np.zeros_like(self.player)
+        for shift, mask in DIRECTIONS:
+            masked_opponent = self.opponent & mask
+            for to_left in [True, False]:
+                tmp = masked_opponent & _shift(moves, shift, to_left)
+                for _ in range(5):
+                    tmp |= masked_opponent & _shift(tmp, shift, to_left)
+                is_bounded = (_shift(tmp, shift, to_left) & self.player) != 0
+                reversed_places |= np.where(is_bounded, tmp, UINT64(0))
+        return reversed_places
+
+    def make_moves(self, moves: np.ndarray):
+        """
+        Place the disks of `moves` and pass the turn to the opponent.
+        Boards with 0 in `moves` just pass.
+        """
+        reversed_places = self.get_reversed_places(moves)
+        player = self.player ^ reversed_places ^ moves
+        opponent = self.opponent ^ reversed_places
+        self.player, self.opponent = opponent, player
+        self.is_black_to_move = ~self.is_black_to_move
+
+    def get_random_moves(self, rng: np.random.Generator) -> np.ndarray:
+        """Choose a legal move uniformly at random for each board (0 for boards that have to pass)."""
+        legal = self.get_legal_masks()
+        num_legal = popcount(legal)
+        num_bits_to_skip = (rng.random(len(self)) * num_legal).astype(np.int64)
+        for i in range(int(num_bits_to_skip.max(initial=0))):
+            skipping = num_bits_to_skip > i
+            legal[skipping] &= legal[skipping] - UINT64(1)
+        return lowest_bit(legal)
+
+    def has_to_pass(self) -> np.ndarray:
+        return self.get_legal_masks() == 0
+
+    def is_terminal(self) -> np.ndarray:
+        return (self.get_legal_masks() == 0) & (self._get_legal_masks(self.opponent, self.player) == 0)
+
+    def get_num_disks(self, color: Color) -> np.ndarray:
+        is_player = self.is_black_to_move if color == Color.BLACK else ~self.is_black_to_move
+        return popcount(np.where(is_player, self.player, self.opponent))
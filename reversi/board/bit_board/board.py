@@ -1,20 +1,88 @@
-from typing import Dict, List, NewType, Optional
+from typing import Dict, Iterator, List, NamedTuple, NewType, Optional, Tuple
+from functools import lru_cache
 
 from reversi.board.color import Color
 from reversi.board.position import Position
 from reversi.board.board import ReversiBoard
 from reversi.board.exceptions import InvalidPositionError
+from reversi.board.zobrist import get_disk_keys
+from .flips import get_rays, get_reversed_places_on_rays
+from .state import BitBoardState
 
 
 Bits = NewType("Bits", int)
 
+# (color, placed disk, flipped disks, hash key before the move)
+BitUndoToken = Tuple[Color, Bits, Bits, int]
+
+
+class BitBoardTables(NamedTuple):
+    """Size-dependent constants of `BitBoard`, indexed by the bit index where it applies."""
+
+    # masks of the squares that can be jumped over when moving horizontally, vertically and diagonally
+    horizontal_mask: Bits
+    vertical_mask: Bits
+    diagonal_mask: Bits
+    # the number of times to extend a line when generating legal moves
+    num_line_steps: int
+    increasing_rays: List[List[Bits]]
+    decreasing_rays: List[List[Bits]]
+    index_to_position: List[Position]
+    disk_keys: Dict[Color, List[int]]
+    flip_keys: List[int]
+
+
+@lru_cache(maxsize=None)
+def get_tables(size: int) -> BitBoardTables:
+    num_squares = size * size
+
+    # bit index -> (row, column) of the bit (see the comment in `BitBoard.reset`)
+    def _generate_mask(is_inside) -> Bits:
+        mask = 0
+        for index in range(num_squares):
+            if is_inside(*divmod(index, size)):
+                mask |= 1 << index
+        return mask
+
+    horizontal_mask = _generate_mask(lambda row, col: 0 < col < size - 1)
+    vertical_mask = _generate_mask(lambda row, col: 0 < row < size - 1)
+    diagonal_mask = horizontal_mask & vertical_mask
+
+    increasing_rays, decreasing_rays = get_rays(size)
+    index_to_position = [Position.from_index(num_squares - 1 - index, size) for index in range(num_squares)]
+
+    disk_keys = {
+        color: [keys[num_squares - 1 - index] for index in range(num_squares)]
+        for color, keys in get_disk_keys(size).items()
+    }
+    flip_keys = [black_key ^ white_key for black_key, white_key in zip(disk_keys[Color.BLACK], disk_keys[Color.WHITE])]
+
+    return BitBoardTables(
+        horizontal_mask=horizontal_mask,
+        vertical_mask=vertical_mask,
+        diagonal_mask=diagonal_mask,
+        num_line_steps=size - 2,
+        increasing_rays=increasing_rays,
+        decreasing_rays=decreasing_rays,
+        index_to_position=index_to_position,
+        disk_keys=disk_keys,
+        flip_keys=flip_keys,
+    )
+
 
 @ReversiBoard.register("bit")
 class BitBoard(ReversiBoard):
+    """
+    Board represented by a pair of integers used as bit sets.
+    Python integers are arbitrary precision, so any even size from 4 to 16 is supported.
+    """
+
     def __init__(self, size: int = 8):
         super().__init__(size=size)
 
-        assert self.size == 8, "BitBoard only supports the standard size"
+        assert 4 <= self.size <= 16 and self.size % 2 == 0, "BitBoard only supports even sizes from 4 to 16"
+
+        self.tables = get_tables(self.size)
 
         self.board: Dict[Color, Bits] = {
             Color.BLACK: 0x0000000000000000,
@@ -23,6 +91,33 @@ class BitBoard(ReversiBoard):
 
         self.reset()
 
+    def __deepcopy__(self, memo):
+        # the tables are shared constants
+        board = self.__class__.__new__(self.__class__)
+        board.__dict__.update(self.__dict__)
+        board.board = dict(self.board)
+        return board
+
+    def __getstate__(self):
+        # the tables are rebuilt from the size instead of being pickled
+        state = dict(self.__dict__)
+        del state["tables"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.tables = get_tables(self.size)
+
+    def to_state(self, color: Color) -> BitBoardState:
+        return BitBoardState(self.board[color], self.board[color.opponent], color)
+
+    @classmethod
+    def from_state(cls, state: BitBoardState, size: int = 8) -> "BitBoard":
+        board = cls(size=size)
+        board.board = {Color.BLACK: state.black, Color.WHITE: state.white}
+        board.hash_key = board._compute_hash_key()
+        return board
+
     def _position_to_bits(self, position: Position) -> Bits:
         max_index = self.size ** 2 - 1
         position_index = max_index - ((position.x * self.size) + position.y)
@@ -38,37 +133,53 @@ class BitBoard(ReversiBoard):
         return None
 
     def get_legal_positions(self, color: Color) -> List[Position]:
-        valid_places = self._get_valid_places(color)
-
-        mask = 1
-        valid_actions = []
-        for x in reversed(range(self.size)):
-            for y in reversed(range(self.size)):
-                if bool(mask & valid_places):
-                    valid_actions.append(Position(x, y))
-                mask <<= 1
-        return valid_actions
+        index_to_position = self.tables.index_to_position
+        return [index_to_position[bit_to_index(bits)] for bits in iterate_bits(self.get_legal_mask(color))]
 
-    def _place(self, position: Position, color: Color):
+    def iterate_legal_moves(self, color: Color) -> Iterator[Bits]:
+        """Yield the legal moves as single-bit masks, which can be passed to `make_move_by_bits`."""
+        return iterate_bits(self.get_legal_mask(color))
 
-        position_bits = self._position_to_bits(position)
+    def _place(self, position: Position, color: Color) -> BitUndoToken:
+        return self.make_move_by_bits(self._position_to_bits(position), color)
 
+    def make_move_by_bits(self, position_bits: Bits, color: Color) -> BitUndoToken:
+        """
+        `make_move` for a single-bit mask of the position.
+        Unlike `make_move`, the position is assumed to be empty.
+        """
         reversed_place = self._get_reversed_places(position_bits, color)
 
         if reversed_place == 0:
-            raise InvalidPositionError(position)
+            raise InvalidPositionError(self.tables.index_to_position[bit_to_index(position_bits)])
 
         self.board[color] ^= reversed_place ^ position_bits
         self.board[color.opponent] ^= reversed_place
 
-    def get_num_disks(self, color: Color) -> int:
+        previous_hash_key = self.hash_key
+        hash_key = previous_hash_key ^ self.tables.disk_keys[color][bit_to_index(position_bits)]
+        flip_keys = self.tables.flip_keys
+        for reversed_bits in iterate_bits(reversed_place):
+            hash_key ^= flip_keys[bit_to_index(reversed_bits)]
+        self.hash_key = hash_key
+
+        return color, position_bits, reversed_place, previous_hash_key
+
+    def unmake_move(self, undo_token: BitUndoToken):
+        # XOR-ing the same masks again restores the previous state
+        color, position_bits, reversed_place, self.hash_key = undo_token
+        self.board[color] ^= reversed_place ^ position_bits
+        self.board[color.opponent] ^= reversed_place
+
+    def _compute_hash_key(self) -> int:
+        hash_key = 0
+        for color, bits in self.board.items():
+            for disk_bits in iterate_bits(bits):
+                hash_key ^= self.tables.disk_keys[color][bit_to_index(disk_bits)]
+        return hash_key
 
-        board = self.board[color]
-        count = 0
-        while board:
-            board &= board - 1
-            count += 1
-        return count
+    def get_num_disks(self, color: Color) -> int:
+        return popcount(self.board[color])
 
     def reset(self):
         # we assign a number for each cell from the right lower corner
@@ -78,126 +189,115 @@ class BitBoard(ReversiBoard):
         #             ... 2 1 0
         # ---------------------
 
-        self.board = {Color.WHITE: 0x0000001008000000, Color.BLACK: 0x0000000810000000}
+        center = self.size // 2
+        self.board = {
+            Color.WHITE: (
+                self._position_to_bits(Position.at(center - 1, center - 1))
+                | self._position_to_bits(Position.at(center, center))
+            ),
+            Color.BLACK: (
+                self._position_to_bits(Position.at(center - 1, center))
+                | self._position_to_bits(Position.at(center, center - 1))
+            ),
+        }
+        self.hash_key = self._compute_hash_key()
 
-    def _get_valid_places(self, color: Color) -> Bits:
+    def get_legal_mask(self, color: Color) -> Bits:
         """Generate legal board."""
-        player_places = self.board[color]
-        opponent_places = self.board[color.opponent]
-        blank_places = ~(player_places | opponent_places)
+        return generate_legal_mask(self.board[color], self.board[color.opponent], self.tables, self.size)
 
-        """
-        This mask looks like this.
-        × ◯ ◯ × 
-        × ◯ ◯ ×
-        × ◯ ◯ ×
-        × ◯ ◯ ×
-        """
-        vertically_masked = opponent_places & 0x7E7E7E7E7E7E7E7E
-        legal = self._get_valid_left(player_places, vertically_masked, blank_places, 1)  # ←
-        legal |= self._get_valid_right(player_places, vertically_masked, blank_places, 1)  # →
+    def _get_reversed_places(self, position_bits, color: Color) -> Bits:
+        """Return get_reversed_places site board."""
+        position_index = bit_to_index(position_bits)
+        return get_reversed_places_on_rays(
+            self.board[color],
+            self.board[color.opponent],
+            self.tables.increasing_rays[position_index],
+            self.tables.decreasing_rays[position_index],
+        )
+
+
+def generate_legal_mask(player_places: Bits, opponent_places: Bits, tables: BitBoardTables, size: int) -> Bits:
+    """Generate the legal moves of `player_places` as a bit mask, using the tables of the board size."""
+    blank_places = ~(player_places | opponent_places)
+    num_steps = tables.num_line_steps
+
+    """
+    This mask looks like this.
+    × ◯ ◯ × 
+    × ◯ ◯ ×
+    × ◯ ◯ ×
+    × ◯ ◯ ×
+    """
+    vertically_masked = opponent_places & tables.horizontal_mask
+    legal = _get_valid_left(player_places, vertically_masked, blank_places, 1, num_steps)  # ←
+    legal |= _get_valid_right(player_places, vertically_masked, blank_places, 1, num_steps)  # →
+
+    """
+    × × × × 
+    ◯ ◯ ◯ ◯
+    ◯ ◯ ◯ ◯
+    × × × ×
+    """
+    horizontally_masked = opponent_places & tables.vertical_mask
+    legal |= _get_valid_left(player_places, horizontally_masked, blank_places, size, num_steps)  # ↑
+    legal |= _get_valid_right(player_places, horizontally_masked, blank_places, size, num_steps)  # ↓
+
+    """
+    × × × × 
+    × ◯ ◯ ×
+    × ◯ ◯ ×
+    × × × ×
+    """
+    around_masked = opponent_places & tables.diagonal_mask
+    legal |= _get_valid_left(player_places, around_masked, blank_places, size - 1, num_steps)  # ↗
+    legal |= _get_valid_left(player_places, around_masked, blank_places, size + 1, num_steps)  # ↖
+    legal |= _get_valid_right(player_places, around_masked, blank_places, size - 1, num_steps)  # ↙
+    legal |= _get_valid_right(player_places, around_masked, blank_places, size + 1, num_steps)  # ↘
+    return legal
+
+
+def _get_valid_left(
+    player_places: Bits, masked_opponent_places: Bits, blank_places: Bits, direction: int, num_steps: int
+) -> Bits:
+    """Direction << dir exploring."""
+    tmp = masked_opponent_places & (player_places << direction)
+    for _ in range(num_steps - 1):
+        tmp |= masked_opponent_places & (tmp << direction)
+    valid_places = blank_places & (tmp << direction)
+    return valid_places
 
-        """
-        × × × × 
-        ◯ ◯ ◯ ◯
-        ◯ ◯ ◯ ◯
-        × × × ×
-        """
-        horizontally_masked = opponent_places & 0x00FFFFFFFFFFFF00
-        legal |= self._get_valid_left(player_places, horizontally_masked, blank_places, 8)  # ↑
-        legal |= self._get_valid_right(player_places, horizontally_masked, blank_places, 8)  # ↓
 
-        """
-        × × × × 
-        × ◯ ◯ ×
-        × ◯ ◯ ×
-        × × × ×
-        """
-        around_masked = opponent_places & 0x007E7E7E7E7E7E00
-        legal |= self._get_valid_left(player_places, around_masked, blank_places, 7)  # ↗
-        legal |= self._get_valid_left(player_places, around_masked, blank_places, 9)  # ↖
-        legal |= self._get_valid_right(player_places, around_masked, blank_places, 7)  # ↙
-        legal |= self._get_valid_right(player_places, around_masked, blank_places, 9)  # ↘
-        return legal
-
-    @staticmethod
-    def _get_valid_left(player_places: Bits, masked_opponent_places: Bits, blank_places: Bits, direction: int,) -> Bits:
-        """Direction << dir exploring."""
-        tmp = masked_opponent_places & (player_places << direction)
-        tmp |= masked_opponent_places & (tmp << direction)
-        tmp |= masked_opponent_places & (tmp << direction)
-        tmp |= masked_opponent_places & (tmp << direction)
-        tmp |= masked_opponent_places & (tmp << direction)
-        tmp |= masked_opponent_places & (tmp << direction)
-        valid_places = blank_places & (tmp << direction)
-        return valid_places
-
-    @staticmethod
-    def _get_valid_right(
-        player_places: Bits, masked_opponent_places: Bits, blank_places: Bits, direction: int,
-    ) -> Bits:
-        """Direction >> dir exploring."""
-        tmp = masked_opponent_places & (player_places >> direction)
-        tmp |= masked_opponent_places & (tmp >> direction)
-        tmp |= masked_opponent_places & (tmp >> direction)
-        tmp |= masked_opponent_places & (tmp >> direction)
+def _get_valid_right(
+    player_places: Bits, masked_opponent_places: Bits, blank_places: Bits, direction: int, num_steps: int
+) -> Bits:
+    """Direction >> dir exploring."""
+    tmp = masked_opponent_places & (player_places >> direction)
+    for _ in range(num_steps - 1):
         tmp |= masked_opponent_places & (tmp >> direction)
-        tmp |= masked_opponent_places & (tmp >> direction)
-        valid_places = blank_places & (tmp >> direction)
-        return valid_places
+    valid_places = blank_places & (tmp >> direction)
+    return valid_places
+
+
+def iterate_bits(bits: Bits) -> Iterator[Bits]:
+    """Yield the set bits from the lowest one, so that the cost scales with the number of set bits."""
+    while bits:
+        lowest_bit = bits & -bits
+        yield lowest_bit
+        bits ^= lowest_bit
 
-    def _get_reversed_places(self, position_bits, color: Color) -> Bits:
-        """Return get_reversed_places site board."""
-        player_places = self.board[color]
-        opponent_places = self.board[color.opponent]
-
-        blank_h = ~(player_places | opponent_places & 0x7E7E7E7E7E7E7E7E)
-        rev = self._get_reversed_left(player_places, blank_h, position_bits, 1)
-        rev |= self._get_reversed_right(player_places, blank_h, position_bits, 1)
-
-        blank_v = ~(player_places | opponent_places & 0x00FFFFFFFFFFFF00)
-
-        rev |= self._get_reversed_left(player_places, blank_v, position_bits, 8)
-        rev |= self._get_reversed_right(player_places, blank_v, position_bits, 8)
-
-        blank_a = ~(player_places | opponent_places & 0x007E7E7E7E7E7E00)
-        rev |= self._get_reversed_left(player_places, blank_a, position_bits, 7)
-        rev |= self._get_reversed_left(player_places, blank_a, position_bits, 9)
-        rev |= self._get_reversed_right(player_places, blank_a, position_bits, 7)
-        rev |= self._get_reversed_right(player_places, blank_a, position_bits, 9)
-        return rev
-
-    def _get_reversed_left(self, player_places, masked_blank_spaces: Bits, site, direction: int) -> Bits:
-        """Direction << for self.get_reversed_places()."""
-        rev: Bits = 0
-        opponent_places = ~(player_places | masked_blank_spaces) & (site << direction)
-        if opponent_places:
-            for i in range(6):
-                opponent_places <<= direction
-                if opponent_places & masked_blank_spaces:
-                    break
-                elif opponent_places & player_places:
-                    rev |= opponent_places >> direction
-                    break
-                else:
-                    opponent_places |= opponent_places >> direction
-        return rev
-
-    def _get_reversed_right(self, player_places, masked_blank_spaces: Bits, site, direction: int) -> Bits:
-        """Direction >> for self.get_reversed_places()."""
-        rev: Bits = 0
-        opponent_places = ~(player_places | masked_blank_spaces) & (site >> direction)
-        if opponent_places:
-            for i in range(6):
-                opponent_places >>= direction
-                if opponent_places & masked_blank_spaces:
-                    break
-                elif opponent_places & player_places:
-                    rev |= opponent_places << direction
-                    break
-                else:
-                    opponent_places |= opponent_places << direction
-        return rev
+
+def bit_to_index(bits: Bits) -> int:
+    """Return the index of a single-bit mask."""
+    return bits.bit_length() - 1
+
+
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:
+    # int.bit_count is only available from Python 3.10
+    def popcount(bits: Bits) -> int:
+        return bin(bits).count("1")
 
 
 def bit_to_boolean(bitboard: Bits, size: int):
@@ -217,3 +317,14 @@ def bit_to_strings(bits: int, size: int):
         bits_matrix += bits_string[i * size : (i + 1) * size]
         bits_matrix += "\n"
     return bits_matrix
+
+
+def board_to_bits(board: ReversiBoard, color: Color) -> Bits:
+    """Return the disks of `color` on any board as bits in the layout of `BitBoard`."""
+    if isinstance(board, BitBoard):
+        return board.board[color]
+    bits = 0
+    for index, position in enumerate(get_tables(board.size).index_to_position):
+        if board.get_color(position) == color:
+            bits |= 1 << index
+    return bits
@@ -0,0 +1,127 @@
+from typing import List, Tuple
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_rays(size: int) -> Tuple[List[List[int]], List[List[int]]]:
+    """
+    Generate the ray masks from every square toward the 8 directions.
+    Rays are split into the ones going to the higher bit indices and the ones going to the lower bit indices,
+    because the first disk on a ray is the lowest set bit in the former and the highest set bit in the latter.
+    Rays shorter than 2 squares are dropped as they can never flip a disk.
+    """
+    increasing_rays = []
+    decreasing_rays = []
+    for index in range(size * size):
+        row, col = divmod(index, size)
+        increasing_rays.append([])
+        decreasing_rays.append([])
+        for row_offset in [-1, 0, 1]:
+            for col_offset in [-1, 0, 1]:
+                if row_offset == col_offset == 0:
+                    continue
+                ray = 0
+                ray_length = 0
+                ray_row, ray_col = row + row_offset, col + col_offset
+                while 0 <= ray_row < size and 0 <= ray_col < size:
+                    ray |= 1 << (ray_row * size + ray_col)
+                    ray_length += 1
+                    ray_row, ray_col = ray_row + row_offset, ray_col + col_offset
+                if ray_length < 2:
+                    continue
+                if row_offset * size + col_offset > 0:
+                    increasing_rays[index].append(ray)
+                else:
+                    decreasing_rays[index].append(ray)
+    return increasing_rays, decreasing_rays
+
+
+INCREASING_RAYS, DECREASING_RAYS = get_rays(8)
+
+
+def get_reversed_places(player_places: int, opponent_places: int, position_index: int) -> int:
+    """
+    Return the disks flipped by placing a disk on the square of `position_index` on the standard board.
+    """
+    return get_reversed_places_on_rays(
+        player_places, opponent_places, INCREASING_RAYS[position_index], DECREASING_RAYS[position_index]
+    )
+
+
+def get_reversed_places_on_rays(
+    player_places: int, opponent_places: int, increasing_rays: List[int], decreasing_rays: List[int]
+) -> int:
+    """
+    Return the disks flipped by placing a disk on the square where the given rays start.
+    For each ray, the first square that is not occupied by the opponent is found with a single bit operation,
+    and the opponent disks in between are flipped if that square is occupied by the player.
+    """
+    reversed_places = 0
+    for ray in increasing_rays:
+        blocker = ray & ~opponent_places
+        outflank = blocker & -blocker & player_places
+        if outflank:
+            reversed_places |= ray & (outflank - 1)
+    for ray in decreasing_rays:
+        blocker = ray & ~opponent_places
+        if blocker:
+            outflank = (1 << (blocker.bit_length() - 1)) & player_places
+            if outflank:
+                reversed_places |= ray & -(outflank << 1)
+    return reversed_places
+
+
+def get_reversed_places_by_shifting(player_places: int, opponent_places: int, position_bits: int) -> int:
+    """
+    The former shift-based implementation of `get_reversed_places`.
+    Kept as a reference for testing and benchmarking the table-driven implementation.
+    """
+    blank_h = ~(player_places | opponent_places & 0x7E7E7E7E7E7E7E7E)
+    rev = _get_reversed_left(player_places, blank_h, position_bits, 1)
+    rev |= _get_reversed_right(player_places, blank_h, position_bits, 1)
+
+    blank_v = ~(player_places | opponent_places & 0x00FFFFFFFFFFFF00)
+
+    rev |= _get_reversed_left(player_places, blank_v, position_bits, 8)
+    rev |= _get_reversed_right(player_places, blank_v, position_bits, 8)
+
+    blank_a = ~(player_places | opponent_places & 0x007E7E7E7E7E7E00)
+    rev |= _get_reversed_left(player_places, blank_a, position_bits, 7)
+    rev |= _get_reversed_left(player_places, blank_a, position_bits, 9)
+    rev |= _get_reversed_right(player_places, blank_a, position_bits, 7)
+    rev |= _get_reversed_right(player_places, blank_a, position_bits, 9)
+    return rev
+
+
+def _get_reversed_left(player_places: int, masked_blank_spaces: int, site: int, direction: int) -> int:
+    """Direction << for get_reversed_places_by_shifting()."""
+    rev = 0
+    opponent_places = ~(player_places | masked_blank_spaces) & (site << direction)
+    if opponent_places:
+        for i in range(6):
+            opponent_places <<= direction
+            if opponent_places & masked_blank_spaces:
+                break
+            elif opponent_places & player_places:
+                rev |= opponent_places >> direction
+                break
+            else:
+                opponent_places |= opponent_places >> direction
+    return rev
+
+
+def _get_reversed_right(player_places: int, masked_blank_spaces: int, site: int, direction: int) -> int:
+    """Direction >> for get_reversed_places_by_shifting()."""
+    rev = 0
+    opponent_places = ~(player_places | masked_blank_spaces) & (site >> direction)
+    if opponent_places:
+        for i in range(6):
+            opponent_places >>= direction
+            if opponent_places & masked_blank_spaces:
+                break
+            elif opponent_places & player_places:
+                rev |= opponent_places << direction
+                break
+            else:
+                opponent_places |= opponent_places << direction
+    return rev
@@ -0,0 +1,23 @@
+from typing import NamedTuple
+
+from reversi.board.color import Color
+
+
+class BitBoardState(NamedTuple):
+    """
+    Compact immutable representation of a bit board with the color to move.
+    Being a plain tuple of two ints and a color, it is cheap to copy and can be used as a dictionary key,
+    so it is suitable for keeping a large number of positions in memory.
+    """
+
+    player: int
+    opponent: int
+    color: Color
+
+    @property
+    def black(self) -> int:
+        return self.player if self.color == Color.BLACK else self.opponent
+
+    @property
+    def white(self) -> int:
+        return self.player if self.color == Color.WHITE else self.opponent
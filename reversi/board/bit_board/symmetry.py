@@ -0,0 +1,97 @@
+"""
+The 8 symmetries of the square board on 64-bit boards, computed with delta swaps.
+A transform is referred to by its index in `TRANSFORMS`.
+"""
+from typing import Callable, List, Tuple
+
+from .state import BitBoardState
+
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+
+def flip_vertical(bits: int) -> int:
+    """Swap the rows (x -> 7 - x)."""
+    bits = ((bits >> 8) & 0x00FF00FF00FF00FF) | ((bits & 0x00FF00FF00FF00FF) << 8)
+    bits = ((bits >> 16) & 0x0000FFFF0000FFFF) | ((bits & 0x0000FFFF0000FFFF) << 16)
+    return (bits >> 32) | ((bits << 32) & MASK_64)
+
+
+def mirror_horizontal(bits: int) -> int:
+    """Swap the columns (y -> 7 - y)."""
+    bits = ((bits >> 1) & 0x5555555555555555) | ((bits & 0x5555555555555555) << 1)
+    bits = ((bits >> 2) & 0x3333333333333333) | ((bits & 0x3333333333333333) << 2)
+    return ((bits >> 4) & 0x0F0F0F0F0F0F0F0F) | ((bits & 0x0F0F0F0F0F0F0F0F) << 4)
+
+
+def transpose(bits: int) -> int:
+    """Flip along the main diagonal (x <-> y)."""
+    t = 0x0F0F0F0F00000000 & (bits ^ (bits << 28))
+    bits ^= t ^ (t >> 28)
+    t = 0x3333000033330000 & (bits ^ (bits << 14))
+    bits ^= t ^ (t >> 14)
+    t = 0x5500550055005500 & (bits ^ (bits << 7))
+    bits ^= t ^ (t >> 7)
+    return bits
+
+
+def anti_transpose(bits: int) -> int:
+    """Flip along the anti-diagonal (x -> 7 - y, y -> 7 - x)."""
+    t = bits ^ (bits << 36)
+    bits ^= 0xF0F0F0F00F0F0F0F & (t ^ (bits >> 36))
+    t = 0xCCCC0000CCCC0000 & (bits ^ (bits << 18))
+    bits ^= t ^ (t >> 18)
+    t = 0xAA00AA00AA00AA00 & (bits ^ (bits << 9))
+    bits ^= t ^ (t >> 9)
+    return bits
+
+
+def rotate_90(bits: int) -> int:
+    return flip_vertical(transpose(bits))
+
+
+def rotate_180(bits: int) -> int:
+    return flip_vertical(mirror_horizontal(bits))
+
+
+def rotate_270(bits: int) -> int:
+    return transpose(flip_vertical(bits))
+
+
+def identity(bits: int) -> int:
+    return bits
+
+
+TRANSFORMS: List[Callable[[int], int]] = [
+    identity,
+    rotate_90,
+    rotate_180,
+    rotate_270,
+    flip_vertical,
+    mirror_horizontal,
+    transpose,
+    anti_transpose,
+]
+
+# INVERSE_TRANSFORMS[t] undoes TRANSFORMS[t]
+INVERSE_TRANSFORMS = [0, 3, 2, 1, 4, 5, 6, 7]
+
+
+def transform_bits(bits: int, transform: int) -> int:
+    return TRANSFORMS[transform](bits)
+
+
+def canonicalize(state: BitBoardState) -> Tuple[BitBoardState, int]:
+    """
+    Return the minimal state among the 8 symmetric variants and the transform that maps `state` to it.
+    A move in the canonical state is mapped back to `state` by
+    `transform_bits(move_bits, INVERSE_TRANSFORMS[transform])`.
+    """
+    best_state = state
+    best_transform = 0
+    for transform in range(1, len(TRANSFORMS)):
+        transform_func = TRANSFORMS[transform]
+        transformed_state = BitBoardState(transform_func(state.player), transform_func(state.opponent), state.color)
+        if transformed_state < best_state:
+            best_state = transformed_state
+            best_transform = transform
+    return best_state, best_transform
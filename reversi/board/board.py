@@ -1,9 +1,10 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 from abc import ABCMeta, abstractmethod
 
 from .color import Color
 from .position import Position
 from .exceptions import PositionOutOfBoundsError, InvalidPositionError
+from .zobrist import COLOR_TO_MOVE_KEYS, get_disk_keys
 
 from registrable import Registrable
 
@@ -12,6 +13,9 @@ class ReversiBoard(Registrable, metaclass=ABCMeta):
     def __init__(self, size: int):
         self.size = size
 
+        # Zobrist hash of the disks on the board, which subclasses update incrementally
+        self.hash_key = 0
+
     def _is_out_of_bounds(self, position: Position) -> bool:
         return not (0 <= position.x < self.size and 0 <= position.y < self.size)
 
@@ -24,16 +28,30 @@ class ReversiBoard(Registrable, metaclass=ABCMeta):
         raise NotImplementedError
 
     def place(self, position: Position, color: Color):
+        self.make_move(position, color)
+
+    def make_move(self, position: Position, color: Color) -> Any:
+        """
+        Place a disk in place and return a token that can be passed to `unmake_move` to revert the move.
+        """
         if self._is_out_of_bounds(position):
             raise PositionOutOfBoundsError(position)
 
         if self.get_color(position) is not None:
             raise InvalidPositionError(position)
 
-        self._place(position, color)
+        return self._place(position, color)
 
     @abstractmethod
-    def _place(self, position: Position, color: Color):
+    def _place(self, position: Position, color: Color) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def unmake_move(self, undo_token: Any):
+        """
+        Revert the move that returned `undo_token` from `make_move`.
+        Moves have to be reverted in the reverse order they were made.
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -43,3 +61,18 @@ class ReversiBoard(Registrable, metaclass=ABCMeta):
     @abstractmethod
     def reset(self):
         raise NotImplementedError
+
+    def get_hash_key(self, color_to_move: Color) -> int:
+        """Zobrist hash of the position including the color to move."""
+        return self.hash_key ^ COLOR_TO_MOVE_KEYS[color_to_move]
+
+    def _compute_hash_key(self) -> int:
+        disk_keys = get_disk_keys(self.size)
+        hash_key = 0
+        for x in range(self.size):
+            for y in range(self.size):
+                position = Position.at(x, y)
+                color = self.get_color(position)
+                if color is not None:
+                    hash_key ^= disk_keys[color][position.to_index(self.size)]
+        return hash_key
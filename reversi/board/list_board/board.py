@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 
 from dataclasses import dataclass
@@ -7,6 +7,7 @@ from reversi.board.color import Color
 from reversi.board.position import Position
 from reversi.board.board import ReversiBoard
 from reversi.board.exceptions import InvalidPositionError
+from reversi.board.zobrist import get_disk_keys
 
 
 @dataclass
@@ -22,7 +23,11 @@ class Direction:
     def __add__(self, other) -> Position:
         if not isinstance(other, Position):
             raise TypeError(type(other))
-        return Position(other.x + self.x_offset, other.y + self.y_offset)
+        return Position.at(other.x + self.x_offset, other.y + self.y_offset)
+
+
+# (placed position, color, flipped positions)
+ListUndoToken = Tuple[Position, Color, List[Position]]
 
 
 @ReversiBoard.register("list")
@@ -30,10 +35,17 @@ class ListBoard(ReversiBoard):
     def __init__(self, size: int = 8):
         super().__init__(size=size)
         self.cells = [[None for _ in range(self.size)] for _ in range(self.size)]
+        self.disk_keys = get_disk_keys(self.size)
 
         self.reset()
 
-    def _set_disk(self, position: Position, color: Color):
+    def _set_disk(self, position: Position, color: Optional[Color]):
+        square_index = position.to_index(self.size)
+        previous_color = self.cells[position.x][position.y]
+        if previous_color is not None:
+            self.hash_key ^= self.disk_keys[previous_color][square_index]
+        if color is not None:
+            self.hash_key ^= self.disk_keys[color][square_index]
         self.cells[position.x][position.y] = color
 
     @staticmethod
@@ -47,22 +59,29 @@ class ListBoard(ReversiBoard):
     def get_color(self, position: Position) -> Optional[Color]:
         return self.cells[position.x][position.y]
 
-    def _place(self, position: Position, color: Color):
+    def _place(self, position: Position, color: Color) -> ListUndoToken:
         # flip other disks
-        num_total_flipped_disk = 0
+        flipped_positions = []
         for direction in self._generate_directions():
             num_bounded_disks = self._count_bounded_disks(position, color, direction)
-            num_total_flipped_disk += num_bounded_disks
             current_position = position
             for _ in range(num_bounded_disks):
                 current_position = direction + current_position
                 current_color = self.get_color(current_position)
                 self._set_disk(current_position, current_color.opponent)
+                flipped_positions.append(current_position)
 
-        if num_total_flipped_disk == 0:
+        if len(flipped_positions) == 0:
             raise InvalidPositionError(position)
 
         self._set_disk(position, color)
+        return position, color, flipped_positions
+
+    def unmake_move(self, undo_token: ListUndoToken):
+        position, color, flipped_positions = undo_token
+        for flipped_position in flipped_positions:
+            self._set_disk(flipped_position, color.opponent)
+        self._set_disk(position, None)
 
     def get_num_disks(self, color: Color) -> int:
         return sum(c == color for cs in self.cells for c in cs)
@@ -71,7 +90,7 @@ class ListBoard(ReversiBoard):
         legal_positions = []
         for x in range(self.size):
             for y in range(self.size):
-                position = Position(x, y)
+                position = Position.at(x, y)
                 if self.get_color(position) is not None:
                     continue
                 if any(self._count_bounded_disks(position, color, d) for d in self._generate_directions()):
@@ -98,13 +117,16 @@ class ListBoard(ReversiBoard):
                 return num_bounded_disks
 
     def reset(self):
+        self.cells = [[None for _ in range(self.size)] for _ in range(self.size)]
+        self.hash_key = 0
+
         center = self.size // 2
 
         # set the initial disks
-        self._set_disk(Position(center - 1, center - 1), Color.WHITE)
-        self._set_disk(Position(center, center), Color.WHITE)
-        self._set_disk(Position(center - 1, center), Color.BLACK)
-        self._set_disk(Position(center, center - 1), Color.BLACK)
+        self._set_disk(Position.at(center - 1, center - 1), Color.WHITE)
+        self._set_disk(Position.at(center, center), Color.WHITE)
+        self._set_disk(Position.at(center - 1, center), Color.BLACK)
+        self._set_disk(Position.at(center, center - 1), Color.BLACK)
 
     def draw_screen(self) -> str:
         return_str = "  a b c d e f g h"
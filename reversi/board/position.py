@@ -8,14 +8,58 @@ Y_TO_MOVE = string.ascii_lowercase
 MOVE_TO_X = {"1": 0, "2": 1, "3": 2, "4": 3, "5": 4, "6": 5, "7": 6, "8": 7}
 MOVE_TO_Y = {"a": 0, "b": 1, "c": 2, "d": 3, "e": 4, "f": 5, "g": 6, "h": 7}
 
+# positions with coordinates less than this are pre-built and shared by `Position.at`
+MAX_INTERNED_SIZE = 16
 
-@dataclass
+
+@dataclass(frozen=True, eq=False)
 class Position:
+    """
+    Immutable position on a board.
+    Use `Position.at` or `Position.from_index` in hot paths, which return shared instances instead of allocating.
+    """
+
+    __slots__ = ("x", "y", "_hash")
+
     x: int
     y: int
 
+    def __post_init__(self):
+        object.__setattr__(self, "_hash", hash((self.x, self.y)))
+
+    @classmethod
+    def at(cls, x: int, y: int) -> "Position":
+        if 0 <= x < MAX_INTERNED_SIZE and 0 <= y < MAX_INTERNED_SIZE:
+            return _INTERNED_POSITIONS[x][y]
+        return cls(x, y)
+
+    @classmethod
+    def from_index(cls, index: int, size: int) -> "Position":
+        """Inverse of `Position.to_index`."""
+        x, y = divmod(index, size)
+        return cls.at(x, y)
+
+    def to_index(self, size: int) -> int:
+        return self.x * size + self.y
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Position):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
     def __hash__(self):
-        return hash((self.x, self.y))
+        return self._hash
+
+    def __reduce__(self):
+        return Position.at, (self.x, self.y)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __str__(self):
         return Y_TO_MOVE[self.y] + X_TO_MOVE[self.x]
@@ -24,6 +68,9 @@ class Position:
     def from_move(cls, move: str) -> "Position":
         y_move, x_move = move
         try:
-            return cls(x=MOVE_TO_X[x_move], y=MOVE_TO_Y[y_move])
+            return cls.at(x=MOVE_TO_X[x_move], y=MOVE_TO_Y[y_move])
         except KeyError:
             raise InvalidPositionError()
+
+
+_INTERNED_POSITIONS = [[Position(x, y) for y in range(MAX_INTERNED_SIZE)] for x in range(MAX_INTERNED_SIZE)]
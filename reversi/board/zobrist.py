@@ -0,0 +1,26 @@
+from typing import Dict, List
+from functools import lru_cache
+import random
+
+from .color import Color
+
+# keys are generated from a fixed seed so that hash keys are the same across processes and runs
+ZOBRIST_SEED = 20211201
+
+_random = random.Random(ZOBRIST_SEED)
+
+COLOR_TO_MOVE_KEYS = {Color.BLACK: 0, Color.WHITE: _random.getrandbits(64)}
+
+# extended on demand in the order of the square index, so the key of a square index does not depend on the board size
+_disk_keys: Dict[Color, List[int]] = {Color.BLACK: [], Color.WHITE: []}
+
+
+@lru_cache(maxsize=None)
+def get_disk_keys(size: int) -> Dict[Color, List[int]]:
+    """Return the keys of the disks on the squares of a board of `size`, indexed by `Position.to_index`."""
+    num_squares = size * size
+    while len(_disk_keys[Color.BLACK]) < num_squares:
+        for keys in _disk_keys.values():
+            keys.append(_random.getrandbits(64))
+    return {color: keys[:num_squares] for color, keys in _disk_keys.items()}
+
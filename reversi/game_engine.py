@@ -1,5 +1,4 @@
-from typing import Optional, List, Tuple, Set, NamedTuple, Dict
-import copy
+from typing import Any, Optional, List, Tuple, Set, NamedTuple, Dict
 
 from reversi.board import ReversiBoard, Color, Position
 from reversi.board.bit_board import BitBoard
@@ -19,7 +18,7 @@ def dump_board_string(board: ReversiBoard, legal_positions_of: Color = None) ->
     for x in range(board.size):
         return_str += "\n" + axis_names[x][1]
         for y in range(board.size):
-            position = Position(x, y)
+            position = Position.at(x, y)
             color = board.get_color(position)
             if color == Color.BLACK:
                 cell_state = "●"
@@ -46,7 +45,8 @@ class ReversiGameEngine:
         self.board = board or BitBoard()
 
         self.current_color = None
-        self.snapshots: List[Tuple[ReversiBoard, Color]] = []
+        # undo tokens of the executed moves with the color to move before each of them
+        self.snapshots: List[Tuple[Any, Color]] = []
 
         self.logging_func = logger.info
         if disable_logging:
@@ -61,8 +61,8 @@ class ReversiGameEngine:
         self.logging_func(f"Current Player: {self.current_color}")
 
     def execute_move(self, position: Position) -> bool:
-        self.snapshots.append((copy.deepcopy(self.board), self.current_color))
-        self.board.place(position, self.current_color)
+        undo_token = self.board.make_move(position, self.current_color)
+        self.snapshots.append((undo_token, self.current_color))
 
         self.logging_func(f"{self.current_color} placed on {position}")
 
@@ -84,7 +84,8 @@ class ReversiGameEngine:
     def restore_from_latest_snapshot(self):
         if len(self.snapshots) == 0:
             return
-        self.board, self.current_color = self.snapshots.pop()
+        undo_token, self.current_color = self.snapshots.pop()
+        self.board.unmake_move(undo_token)
 
         self.logging_func("Restored from the latest snapshot.")
         self.logging_func(
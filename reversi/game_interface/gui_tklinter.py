@@ -73,7 +73,7 @@ class BoardGrids:
 
         for x in range(board.size):
             for y in range(board.size):
-                position = Position(x, y)
+                position = Position.at(x, y)
                 if position in legal_positions:
                     self.canvas.itemconfig(self.rectangles[x][y], fill="green")
                 else:
@@ -86,7 +86,7 @@ class BoardGrids:
         id = self.canvas.find_closest(x_pixel, y_pixel)
         tag = self.canvas.gettags(id[0])[0]
         x, y = map(int, tag.split("_")[1])
-        return Position(x, y)
+        return Position.at(x, y)
 
 
 @GameInterface.register("tklinter")
@@ -15,7 +15,7 @@ class CNNFeatureExtractor(BoardFeatureExtractor):
         board_matrix = np.full(shape=(board.size, board.size), fill_value=-1)
         for x in range(board.size):
             for y in range(board.size):
-                color = board.get_color(Position(x, y))
+                color = board.get_color(Position.at(x, y))
                 if color is not None:
                     board_matrix[x][y] = color.value
 
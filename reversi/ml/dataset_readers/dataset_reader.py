@@ -14,12 +14,11 @@ logger = logging.getLogger(__name__)
 
 
 def position_to_index(position: Position, size: int) -> int:
-    return position.x * size + position.y
+    return position.to_index(size)
 
 
 def index_to_position(index: int, size: int) -> Position:
-    x, y = divmod(index, size)
-    return Position(x, y)
+    return Position.from_index(index, size)
 
 
 @DatasetReader.register("reversi_move_prediction")
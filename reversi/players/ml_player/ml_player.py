@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Tuple
 from pathlib import Path
 import json
 import torch
@@ -6,29 +6,42 @@ import torch
 from my_ml.model import Model
 from reversi.board import Position, ReversiBoard, Color
 from reversi.players import Player
+from reversi.players.opening_book import OpeningBook
 from reversi.ml.models.move_predictor import MovePredictor
 from reversi.ml.board_feature_extractors import BoardFeatureExtractor
 from reversi.ml.dataset_readers.dataset_reader import index_to_position
 
 
-@Player.register("ml")
-class MlPlayer(Player):
-    def __init__(self, serialization_dir: str, color: Color):
-        super().__init__(color)
+def load_move_predictor(serialization_dir: str) -> Tuple[BoardFeatureExtractor, MovePredictor]:
+    """Load the feature extractor and the trained model in the serialization directory of the training."""
+    config_file_path = Path(serialization_dir) / "config.json"
+    config = json.load(open(config_file_path))
+
+    feature_extractor_params = config["reader"]["feature_extractor"]
+    feature_extractor = BoardFeatureExtractor.from_params(feature_extractor_params)
 
-        config_file_path = Path(serialization_dir) / "config.json"
-        config = json.load(open(config_file_path))
+    model_params = config["model"]
+    predictor = Model.from_params(model_params)
+    assert isinstance(predictor, MovePredictor)
+    weight_path = Path(serialization_dir) / "best.th"
+    predictor.load_state_dict(torch.load(weight_path, map_location="cpu"))
+    predictor.eval()
+    return feature_extractor, predictor
 
-        feature_extractor_params = config["reader"]["feature_extractor"]
-        self.feature_extractor = BoardFeatureExtractor.from_params(feature_extractor_params)
 
-        model_params = config["model"]
-        self.predictor = Model.from_params(model_params)
-        assert isinstance(self.predictor, MovePredictor)
-        weight_path = Path(serialization_dir) / "best.th"
-        self.predictor.load_state_dict(torch.load(weight_path, map_location="cpu"))
+@Player.register("ml")
+class MlPlayer(Player):
+    def __init__(self, serialization_dir: str, color: Color, opening_book: OpeningBook = None):
+        super().__init__(color)
+        self.opening_book = opening_book
+        self.feature_extractor, self.predictor = load_move_predictor(serialization_dir)
 
     def choose_position(self, current_board: ReversiBoard, legal_positions: List[Position]) -> Position:
+        if self.opening_book is not None:
+            position = self.opening_book.choose_position(current_board, self.color)
+            if position is not None:
+                return position
+
         feature = self.feature_extractor(current_color=self.color, board=current_board)
 
         output_dict = self.predictor.forward(board_feature=torch.from_numpy(feature).unsqueeze(0))
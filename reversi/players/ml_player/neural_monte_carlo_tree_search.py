@@ -0,0 +1,163 @@
+from typing import Dict, List, Optional, Tuple
+import time
+
+import numpy as np
+import torch
+
+from reversi.board import Position
+from reversi.players.search_players.search_player import ReversiSearchNode, SKIP_ACTION
+from search_algorithm import SearchAlgorithm
+from search_algorithm.monte_carlo_tree_search import MonteCarloTreeNode, MonteCarloTreeSearch
+from search_algorithm.tree_node import ActionStatistics, NodeEvaluator
+from .ml_player import load_move_predictor
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@SearchAlgorithm.register("neural_mcts")
+class NeuralMonteCarloTreeSearch(MonteCarloTreeSearch):
+    """
+    PUCT Monte Carlo tree search with the priors given by the policy of a `MovePredictor`
+    loaded from `serialization_dir` as in `MlPlayer`.
+    Each step selects up to `batch_size` leaves, adding a virtual loss of `virtual_loss` to the nodes on the path
+    to each of them so that the following selections take other paths,
+    computes the priors of all the leaves in a single forward pass of the model,
+    and then expands, simulates and backpropagates the leaves one by one.
+    Selecting a batch stops early after `max_batch_wait` seconds or when a leaf is selected twice.
+    """
+
+    def __init__(
+        self,
+        serialization_dir: str,
+        node_evaluator: NodeEvaluator,
+        max_time: float = None,
+        max_num_playouts: int = 10000,
+        exploration_constant: float = 1.4,
+        seed: int = None,
+        reuse_tree: bool = True,
+        batch_size: int = 16,
+        max_batch_wait: float = 0.01,
+        virtual_loss: float = 1.0,
+    ):
+        super().__init__(
+            node_evaluator,
+            max_time=max_time,
+            max_num_playouts=max_num_playouts,
+            exploration_constant=exploration_constant,
+            selection="puct",
+            seed=seed,
+            reuse_tree=reuse_tree,
+        )
+        self.feature_extractor, self.predictor = load_move_predictor(serialization_dir)
+        self.batch_size = batch_size
+        self.max_batch_wait = max_batch_wait
+        self.virtual_loss = virtual_loss
+
+        self.num_forward_passes = 0
+
+    def search_root_statistics(self, current_node: ReversiSearchNode) -> Dict[Position, ActionStatistics]:
+        self.num_forward_passes = 0
+        statistics = super().search_root_statistics(current_node)
+        logger.info(f"Number of forward passes: {self.num_forward_passes}")
+        return statistics
+
+    def get_priors(self, current_node: ReversiSearchNode, actions: List[Position]) -> List[float]:
+        return self._compute_priors([self._get_feature(current_node, actions)], [actions])[0]
+
+    def _get_feature(self, node: ReversiSearchNode, actions: List[Position]) -> Optional[np.ndarray]:
+        """The input of the model, or None if the node does not need the model, i.e., it can only pass."""
+        if actions == [SKIP_ACTION]:
+            return None
+        return self.feature_extractor(board=node.board, current_color=node.current_color)
+
+    def _compute_priors(
+        self, features: List[Optional[np.ndarray]], actions_list: List[List[Position]]
+    ) -> List[List[float]]:
+        """Compute the priors of the nodes with their features in a single forward pass."""
+        batch_indices = [i for i, feature in enumerate(features) if feature is not None]
+        logits = None
+        if batch_indices:
+            board_feature = torch.from_numpy(np.stack([features[i] for i in batch_indices]))
+            with torch.no_grad():
+                logits = self.predictor.forward(board_feature=board_feature)["logits"]
+            self.num_forward_passes += 1
+
+        priors_list = [[1.0] * len(actions) for actions in actions_list]
+        board_size = self.predictor.board_size
+        for logits_index, i in enumerate(batch_indices):
+            action_indices = [action.to_index(board_size) for action in actions_list[i]]
+            priors_list[i] = torch.softmax(logits[logits_index, action_indices], dim=0).tolist()
+        return priors_list
+
+    def run_playout(self, current_node: ReversiSearchNode):
+        """
+        Run a batch of playouts.
+        `current_node` is moved forward in place and restored to its original state before returning.
+        """
+        batch_size = max(1, min(self.batch_size, self.max_num_playouts - self.num_playouts))
+        start_time = time.perf_counter()
+
+        # (path to the leaf, valid actions of the leaf if it is to be expanded, feature of the leaf)
+        batch: List[Tuple[List[MonteCarloTreeNode], Optional[List[Position]], Optional[np.ndarray]]] = []
+        selected_leaf_ids = set()
+        while len(batch) < batch_size:
+            tree_node = self.root
+            path = [tree_node]
+            undo_tokens = []
+            try:
+                while tree_node.is_expanded and not tree_node.is_terminal:
+                    tree_node = self._select_child(tree_node)
+                    undo_tokens.append(current_node.make_move(tree_node.action))
+                    path.append(tree_node)
+                if id(tree_node) in selected_leaf_ids:
+                    # the virtual loss did not divert the selection
+                    break
+
+                actions, feature = None, None
+                if not tree_node.is_expanded and not current_node.is_terminal:
+                    actions = current_node.get_valid_actions()
+                    feature = self._get_feature(current_node, actions)
+            finally:
+                for undo_token in reversed(undo_tokens):
+                    current_node.unmake_move(undo_token)
+
+            selected_leaf_ids.add(id(tree_node))
+            batch.append((path, actions, feature))
+            self._add_virtual_loss(path, 1)
+            if time.perf_counter() - start_time > self.max_batch_wait:
+                break
+
+        expanded_batch = [(path, actions, feature) for path, actions, feature in batch if actions is not None]
+        priors_list = self._compute_priors(
+            [feature for _, _, feature in expanded_batch], [actions for _, actions, _ in expanded_batch]
+        )
+        priors_by_leaf = {id(path[-1]): priors for (path, _, _), priors in zip(expanded_batch, priors_list)}
+
+        for path, _, _ in batch:
+            self._add_virtual_loss(path, -1)
+            undo_tokens = []
+            try:
+                for tree_node in path[1:]:
+                    undo_tokens.append(current_node.make_move(tree_node.action))
+                tree_node = path[-1]
+                if not tree_node.is_expanded:
+                    self._expand(tree_node, current_node, priors_by_leaf.get(id(tree_node)))
+                    if not tree_node.is_terminal:
+                        tree_node = self._select_child(tree_node)
+                        undo_tokens.append(current_node.make_move(tree_node.action))
+                        path.append(tree_node)
+
+                score = self.simulate(current_node)
+            finally:
+                for undo_token in reversed(undo_tokens):
+                    current_node.unmake_move(undo_token)
+
+            self._backpropagate(path, score)
+
+    def _add_virtual_loss(self, path: List[MonteCarloTreeNode], sign: int):
+        """Count a lost visit on the path (or remove it if `sign` is -1) while the leaf is being evaluated."""
+        for tree_node in path:
+            tree_node.visit_count += sign
+            tree_node.value_sum -= sign * self.virtual_loss
@@ -0,0 +1,182 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import mmap
+import struct
+
+from registrable import FromParams
+from reversi.board import Color, InvalidPositionError, Position, ReversiBoard
+from reversi.board.bit_board import BitBoard, BitBoardState
+from reversi.board.bit_board.board import bit_to_index, board_to_bits, get_tables
+from reversi.board.bit_board.symmetry import INVERSE_TRANSFORMS, TRANSFORMS, canonicalize, transform_bits
+from reversi.ml.dataset_readers.wtb_file_parser import parse_wtb_file
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+BOOK_SIZE = 8
+MAGIC = b"RVBK"
+HEADER = struct.Struct("<4sI")
+# player disks, opponent disks, number of games, number of wins, sum of the final disk differences, move index
+RECORD = struct.Struct("<QQIIiB3x")
+KEY = struct.Struct("<QQ")
+
+
+class BookMove(NamedTuple):
+    """Statistics of a move in a position, from the perspective of the side to move."""
+
+    position: Position
+    num_games: int
+    num_wins: int
+    average_disk_difference: float
+
+    @property
+    def win_rate(self) -> float:
+        return self.num_wins / self.num_games
+
+
+def _position_to_bits(position: Position) -> int:
+    return 1 << (BOOK_SIZE * BOOK_SIZE - 1 - position.to_index(BOOK_SIZE))
+
+
+def get_book_key(board: ReversiBoard, color: Color) -> Tuple[BitBoardState, int]:
+    """Return the canonical state of the position among its symmetries and the transform to it."""
+    state = BitBoardState(board_to_bits(board, color), board_to_bits(board, color.opponent), color)
+    return canonicalize(state)
+
+
+def canonicalize_move(board: ReversiBoard, color: Color, position: Position) -> Tuple[BitBoardState, int]:
+    """
+    Return the canonical state of the position and the index of the move in it.
+    Moves that are symmetric in a symmetric position (e.g., the four first moves) share the same index.
+    """
+    canonical_state, _ = get_book_key(board, color)
+    player, opponent = board_to_bits(board, color), board_to_bits(board, color.opponent)
+    move_bits = min(
+        transform_bits(_position_to_bits(position), transform)
+        for transform in range(len(TRANSFORMS))
+        if transform_bits(player, transform) == canonical_state.player
+        and transform_bits(opponent, transform) == canonical_state.opponent
+    )
+    return canonical_state, bit_to_index(move_bits)
+
+
+def collect_book_statistics(
+    file_paths: Iterable[str], max_num_moves: int
+) -> Dict[Tuple[int, int, int], Tuple[int, int, int]]:
+    """
+    Replay the games in the WTHOR files and sum up the statistics of the moves in the first `max_num_moves` moves
+    as (canonical player disks, canonical opponent disks, canonical move index) -> (games, wins, disk difference sum).
+    """
+    board = BitBoard(BOOK_SIZE)
+    statistics: Dict[Tuple[int, int, int], Tuple[int, int, int]] = {}
+    for file_path in file_paths:
+        logger.info(f"Reading {file_path}")
+        for game_data in parse_wtb_file(file_path):
+            num_black_disks, num_white_disks = game_data["result"]
+            black_disk_difference = num_black_disks - num_white_disks
+
+            board.reset()
+            color = Color.BLACK
+            keys = []
+            try:
+                for move in game_data["moves"][:max_num_moves]:
+                    position = Position.from_move(move)
+                    # passes are not recorded in the files
+                    if board.get_legal_mask(color) == 0:
+                        color = color.opponent
+                    state, move_index = canonicalize_move(board, color, position)
+                    keys.append(((state.player, state.opponent, move_index), color))
+                    board.make_move(position, color)
+                    color = color.opponent
+            except InvalidPositionError:
+                logger.debug(f"Skipped a game with an invalid move.")
+                continue
+
+            for key, color in keys:
+                disk_difference = black_disk_difference if color == Color.BLACK else -black_disk_difference
+                num_games, num_wins, disk_difference_sum = statistics.get(key, (0, 0, 0))
+                statistics[key] = (
+                    num_games + 1,
+                    num_wins + (disk_difference > 0),
+                    disk_difference_sum + disk_difference,
+                )
+    return statistics
+
+
+def build_opening_book(file_paths: Iterable[str], output_path: str, max_num_moves: int = 20) -> int:
+    """Build an opening book file from WTHOR files and return the number of the records."""
+    statistics = collect_book_statistics(file_paths, max_num_moves)
+    with open(output_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(statistics)))
+        # sorted by the position for binary search
+        for (player, opponent, move_index), (num_games, num_wins, disk_difference_sum) in sorted(statistics.items()):
+            f.write(RECORD.pack(player, opponent, num_games, num_wins, disk_difference_sum, move_index))
+    return len(statistics)
+
+
+class OpeningBook(FromParams):
+    """
+    Moves of the positions in an opening book file built by `build_opening_book`.
+    The positions are looked up by binary search on the memory-mapped file, so the book is not loaded into memory.
+    Positions are stored in the canonical form among the 8 symmetries of the board,
+    so the book only works on boards of size `BOOK_SIZE`.
+    `choose_position` returns the move with the best win rate among the ones played in at least `min_num_games` games.
+    """
+
+    def __init__(self, path: str, min_num_games: int = 10):
+        self.path = path
+        self.min_num_games = min_num_games
+
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.num_records = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an opening book file.")
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def _get_key(self, record_index: int) -> Tuple[int, int]:
+        return KEY.unpack_from(self._mmap, HEADER.size + record_index * RECORD.size)
+
+    def lookup(self, board: ReversiBoard, color: Color) -> List[BookMove]:
+        if board.size != BOOK_SIZE:
+            return []
+        state, transform = get_book_key(board, color)
+        key = (state.player, state.opponent)
+
+        # find the first record of the position
+        low, high = 0, self.num_records
+        while low < high:
+            middle = (low + high) // 2
+            if self._get_key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        index_to_position = get_tables(BOOK_SIZE).index_to_position
+        inverse_transform = INVERSE_TRANSFORMS[transform]
+        book_moves = []
+        for record_index in range(low, self.num_records):
+            player, opponent, num_games, num_wins, disk_difference_sum, move_index = RECORD.unpack_from(
+                self._mmap, HEADER.size + record_index * RECORD.size
+            )
+            if (player, opponent) != key:
+                break
+            move_bits = transform_bits(1 << move_index, inverse_transform)
+            position = index_to_position[bit_to_index(move_bits)]
+            book_moves.append(BookMove(position, num_games, num_wins, disk_difference_sum / num_games))
+        return book_moves
+
+    def choose_position(self, board: ReversiBoard, color: Color) -> Optional[Position]:
+        """Return the best book move, or None if the position is out of the book."""
+        book_moves = [move for move in self.lookup(board, color) if move.num_games >= self.min_num_games]
+        if not book_moves:
+            return None
+        best_move = max(book_moves, key=lambda move: (move.win_rate, move.average_disk_difference))
+        logger.info(
+            f"Book move {best_move.position}: {best_move.num_games} games, win rate {best_move.win_rate:.3f}, "
+            f"average disk difference {best_move.average_disk_difference:.1f}"
+        )
+        return best_move.position
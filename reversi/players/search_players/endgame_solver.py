@@ -0,0 +1,262 @@
+from typing import List, Optional, Tuple
+import math
+import time
+
+from reversi.board import Color, Position
+from reversi.board.bit_board.board import (
+    Bits,
+    bit_to_index,
+    board_to_bits,
+    generate_legal_mask,
+    get_tables,
+    iterate_bits,
+    popcount,
+)
+from reversi.board.bit_board.flips import get_reversed_places_on_rays
+from search_algorithm import SearchAlgorithm
+from search_algorithm.search_budget import SearchBudget, SearchBudgetExhausted
+from search_algorithm.search_statistics import SearchStatistics
+
+from .search_player import ReversiSearchNode, SKIP_ACTION
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+SOLVER_MODES = ["exact", "wld"]
+
+# positions with at least this number of empty squares order moves by the mobility of the opponent,
+# and the others by the parity of the regions
+FASTEST_FIRST_MIN_NUM_EMPTIES = 7
+
+
+def get_region_masks(size: int) -> List[Bits]:
+    """The four quadrants of the board, which are the regions for parity ordering."""
+    half = size // 2
+    region_masks = [0, 0, 0, 0]
+    for index in range(size * size):
+        row, col = divmod(index, size)
+        region_masks[(row >= half) * 2 + (col >= half)] |= 1 << index
+    return region_masks
+
+
+class EndgameSolver:
+    """
+    Alpha-beta search to the end of the game directly on the bits of the disks.
+    Scores are the final disk differences from the perspective of the side to move,
+    where the empty squares are counted for the winner.
+    Moves are ordered by the number of the opponent's replies (fastest-first) with many empty squares,
+    and by the parity of the regions (moves in regions with an odd number of empty squares first) near the end.
+    """
+
+    def __init__(self, size: int = 8):
+        self.size = size
+        self.tables = get_tables(size)
+        self.num_squares = size * size
+        self.region_masks = get_region_masks(size)
+
+        self.num_searched_nodes = 0
+        self._budget = SearchBudget()
+
+    def solve(
+        self,
+        player_places: Bits,
+        opponent_places: Bits,
+        alpha: float = -math.inf,
+        beta: float = math.inf,
+        max_time: float = None,
+    ) -> Tuple[Optional[Bits], float]:
+        """
+        Return the best move (None if the side to move has to pass) and its score.
+        The score is exact if it is within (alpha, beta), otherwise it is a bound beyond the window,
+        e.g., the window (-1, 1) only tells a win, a loss or a draw.
+        Raise `SearchBudgetExhausted` when running out of `max_time`.
+        """
+        self.num_searched_nodes = 0
+        self._budget = SearchBudget(max_time)
+
+        moves = self._order_moves(player_places, opponent_places)
+        if not moves:
+            return None, -self._search(opponent_places, player_places, -beta, -alpha, has_passed=True)
+
+        best_move, best_score = None, -math.inf
+        for move, reversed_places in moves:
+            score = -self._search(
+                opponent_places ^ reversed_places,
+                player_places ^ reversed_places ^ move,
+                -beta,
+                -max(alpha, best_score),
+                has_passed=False,
+            )
+            if score > best_score:
+                best_move, best_score = move, score
+                if best_score >= beta:
+                    break
+        return best_move, best_score
+
+    def _search(self, player_places: Bits, opponent_places: Bits, alpha: float, beta: float, has_passed: bool) -> int:
+        self.num_searched_nodes += 1
+        if self.num_searched_nodes >= self._budget.next_check_num_nodes:
+            self._budget.check(self.num_searched_nodes)
+
+        moves = self._order_moves(player_places, opponent_places)
+        if not moves:
+            if has_passed:
+                return self._get_final_score(player_places, opponent_places)
+            return -self._search(opponent_places, player_places, -beta, -alpha, has_passed=True)
+
+        best_score = -math.inf
+        for move, reversed_places in moves:
+            score = -self._search(
+                opponent_places ^ reversed_places, player_places ^ reversed_places ^ move, -beta, -alpha, False
+            )
+            if score > best_score:
+                best_score = score
+                if best_score > alpha:
+                    alpha = best_score
+                    if alpha >= beta:
+                        break
+        return best_score
+
+    def _order_moves(self, player_places: Bits, opponent_places: Bits) -> List[Tuple[Bits, Bits]]:
+        """Return the legal moves in the order to search as (move, reversed places)."""
+        tables = self.tables
+        legal_mask = generate_legal_mask(player_places, opponent_places, tables, self.size)
+        moves = []
+        for move in iterate_bits(legal_mask):
+            index = bit_to_index(move)
+            reversed_places = get_reversed_places_on_rays(
+                player_places, opponent_places, tables.increasing_rays[index], tables.decreasing_rays[index]
+            )
+            moves.append((move, reversed_places))
+        if len(moves) <= 1:
+            return moves
+
+        empty_places = ~(player_places | opponent_places) & ((1 << self.num_squares) - 1)
+        if popcount(empty_places) >= FASTEST_FIRST_MIN_NUM_EMPTIES:
+            # the fewer replies the opponent has, the more likely the move is good and the smaller the subtree is
+            return sorted(
+                moves,
+                key=lambda move_and_reversed_places: popcount(
+                    generate_legal_mask(
+                        opponent_places ^ move_and_reversed_places[1],
+                        player_places ^ move_and_reversed_places[1] ^ move_and_reversed_places[0],
+                        tables,
+                        self.size,
+                    )
+                ),
+            )
+
+        # playing in a region with an odd number of empty squares tends to leave the last move in it to us
+        odd_regions = 0
+        for region_mask in self.region_masks:
+            if popcount(empty_places & region_mask) % 2 == 1:
+                odd_regions |= region_mask
+        return sorted(moves, key=lambda move_and_reversed_places: not move_and_reversed_places[0] & odd_regions)
+
+    def _get_final_score(self, player_places: Bits, opponent_places: Bits) -> int:
+        num_player_disks = popcount(player_places)
+        num_opponent_disks = popcount(opponent_places)
+        num_empties = self.num_squares - num_player_disks - num_opponent_disks
+        score = num_player_disks - num_opponent_disks
+        if score > 0:
+            return score + num_empties
+        if score < 0:
+            return score - num_empties
+        return 0
+
+
+@SearchAlgorithm.register("reversi_endgame")
+class ReversiEndgameSearch(SearchAlgorithm):
+    """
+    Solve the game exactly with `EndgameSolver` when at most `max_num_empties` squares are empty,
+    and use `search_algorithm` otherwise.
+    In the "exact" mode the move with the best final disk difference is chosen,
+    and in the "wld" mode any winning move (or drawing move if there is no winning move), which is faster.
+    If `max_time` is given and the solver runs out of it, `search_algorithm` is used for the rest of the time.
+    Setting `max_time` after construction (e.g., by a time manager) also sets the one of `search_algorithm`.
+    """
+
+    def __init__(
+        self,
+        search_algorithm: SearchAlgorithm = None,
+        max_num_empties: int = 12,
+        mode: str = "exact",
+        max_time: float = None,
+    ):
+        if mode not in SOLVER_MODES:
+            raise ValueError(f"mode must be one of {SOLVER_MODES}, but got {mode}.")
+        self.search_algorithm = search_algorithm
+        self.max_num_empties = max_num_empties
+        self.mode = mode
+        # `search_algorithm` keeps its own time limit until `max_time` is set
+        self._max_time = max_time
+
+        self._solvers = {}
+        # the score found by the last solved search
+        self.score: Optional[float] = None
+        # whether the last search is delegated to `search_algorithm`
+        self._is_delegated = False
+
+    @property
+    def max_time(self) -> Optional[float]:
+        return self._max_time
+
+    @max_time.setter
+    def max_time(self, max_time: Optional[float]):
+        self._max_time = max_time
+        if self.search_algorithm is not None:
+            self.search_algorithm.max_time = max_time
+
+    def get_solver(self, size: int) -> EndgameSolver:
+        if size not in self._solvers:
+            self._solvers[size] = EndgameSolver(size)
+        return self._solvers[size]
+
+    @property
+    def num_searched_nodes(self) -> int:
+        return sum(solver.num_searched_nodes for solver in self._solvers.values())
+
+    def get_statistics(self, elapsed_time: float) -> SearchStatistics:
+        if self._is_delegated:
+            return self.search_algorithm.get_statistics(elapsed_time)
+        return SearchStatistics(elapsed_time=elapsed_time, num_searched_nodes=self.num_searched_nodes)
+
+    def search_best_action(self, current_node: ReversiSearchNode) -> Position:
+        board = current_node.board
+        num_empties = board.size ** 2 - board.get_num_disks(Color.BLACK) - board.get_num_disks(Color.WHITE)
+        self._is_delegated = num_empties > self.max_num_empties and self.search_algorithm is not None
+        if self._is_delegated:
+            return self.search_algorithm.search_best_action(current_node)
+
+        solver = self.get_solver(board.size)
+        alpha, beta = (-1, 1) if self.mode == "wld" else (-math.inf, math.inf)
+        start_time = time.perf_counter()
+        try:
+            move, self.score = solver.solve(
+                board_to_bits(board, current_node.current_color),
+                board_to_bits(board, current_node.current_color.opponent),
+                alpha=alpha,
+                beta=beta,
+                max_time=self.max_time,
+            )
+        except SearchBudgetExhausted:
+            if self.search_algorithm is None:
+                raise
+            logger.info(f"Run out of time to solve {num_empties} empty squares.")
+            self._is_delegated = True
+            return self._search_in_remaining_time(current_node, time.perf_counter() - start_time)
+
+        logger.info(f"Solved {num_empties} empty squares: score {self.score}, nodes {solver.num_searched_nodes}")
+        if move is None:
+            return SKIP_ACTION
+        return solver.tables.index_to_position[bit_to_index(move)]
+
+    def _search_in_remaining_time(self, current_node: ReversiSearchNode, elapsed_time: float) -> Position:
+        """Search with `search_algorithm` in the time left after the solver gave up."""
+        original_max_time = self.search_algorithm.max_time
+        self.search_algorithm.max_time = max(self.max_time - elapsed_time, 0.0)
+        try:
+            return self.search_algorithm.search_best_action(current_node)
+        finally:
+            self.search_algorithm.max_time = original_max_time
@@ -22,7 +22,7 @@ class ReversiManualEvaluator(NodeEvaluator):
         score = 0
         for x in range(board.size):
             for y in range(board.size):
-                position = Position(x, y)
+                position = Position.at(x, y)
                 if board.get_color(position) == node.playing_color:
                     score += score_matrix[x][y]
                 else:
@@ -1,10 +1,15 @@
-from typing import List
+from typing import Any, List, Optional, Tuple
 import copy
+import math
+import time
 
 from reversi.board import Position, ReversiBoard, Color
 from reversi.players import Player
+from reversi.players.opening_book import OpeningBook
 
 from search_algorithm import SearchAlgorithm
+from search_algorithm.search_budget import TimeManager
+from search_algorithm.search_statistics import SearchStatistics
 
 from search_algorithm.min_max_search import TreeNode
 
@@ -24,31 +29,93 @@ class ReversiSearchNode(TreeNode):
 
     def get_valid_actions(self) -> List[Position]:
         legal_positions = self.board.get_legal_positions(self.current_color)
+        if len(legal_positions) == 0 and not self.is_terminal:
+            # the only thing to do is to pass the turn to the opponent
+            return [SKIP_ACTION]
         return legal_positions
 
     def get_next_node(self, position: Position) -> TreeNode:
         new_board = copy.deepcopy(self.board)
-        new_board.place(position, self.current_color)
+        if position is not SKIP_ACTION:
+            new_board.place(position, self.current_color)
         return ReversiSearchNode(new_board, self.current_color.opponent, self.playing_color)
 
+    def make_move(self, position: Position) -> Tuple[Any, Color]:
+        board_undo_token = None
+        if position is not SKIP_ACTION:
+            board_undo_token = self.board.make_move(position, self.current_color)
+        previous_color = self.current_color
+        self.current_color = previous_color.opponent
+        return board_undo_token, previous_color
+
+    def unmake_move(self, undo_token: Tuple[Any, Color]):
+        board_undo_token, self.current_color = undo_token
+        if board_undo_token is not None:
+            self.board.unmake_move(board_undo_token)
+
     @property
     def is_opponent_turn(self) -> bool:
         return self.current_color == self.playing_color.opponent
 
     @property
     def is_terminal(self) -> bool:
-        legal_positions = self.board.get_legal_positions(self.current_color) + self.board.get_legal_positions(
-            self.current_color
+        return (
+            len(self.board.get_legal_positions(self.current_color)) == 0
+            and len(self.board.get_legal_positions(self.current_color.opponent)) == 0
         )
-        return len(legal_positions) == 0
+
+    @property
+    def hash_key(self) -> int:
+        return self.board.get_hash_key(self.current_color)
 
 
 @Player.register("search")
 class MinMaxPlayer(Player):
-    def __init__(self, color: Color, search_algorithm: SearchAlgorithm):
+    """
+    A player that chooses positions with `search_algorithm`.
+    If `time_manager` is given, the `max_time` of `search_algorithm` is set for each move
+    by splitting the remaining time of the game across the remaining moves.
+    If `opening_book` is given, book moves are played without searching.
+    The statistics of the last search are kept in `last_search_statistics` (None after a book move).
+    """
+
+    def __init__(
+        self,
+        color: Color,
+        search_algorithm: SearchAlgorithm,
+        time_manager: TimeManager = None,
+        opening_book: OpeningBook = None,
+    ):
         super().__init__(color)
         self.search_algorithm = search_algorithm
+        self.time_manager = time_manager
+        self.opening_book = opening_book
+        self._last_num_disks = math.inf
+        self.last_search_statistics: Optional[SearchStatistics] = None
 
     def choose_position(self, current_board: ReversiBoard, legal_positions: List[Position]) -> Position:
-        current_node = ReversiSearchNode(current_board, current_color=self.color, playing_color=self.color)
-        return self.search_algorithm.search_best_action(current_node)
+        self.last_search_statistics = None
+        if self.opening_book is not None:
+            position = self.opening_book.choose_position(current_board, self.color)
+            if position is not None:
+                return position
+
+        # search algorithms modify the board in place, so work on a copy not to touch the game's board
+        current_node = ReversiSearchNode(
+            copy.deepcopy(current_board), current_color=self.color, playing_color=self.color
+        )
+        if self.time_manager is not None:
+            num_disks = current_board.get_num_disks(Color.BLACK) + current_board.get_num_disks(Color.WHITE)
+            if num_disks < self._last_num_disks:
+                # a new game has started
+                self.time_manager.reset()
+            self._last_num_disks = num_disks
+            # each side plays about half of the empty squares
+            num_remaining_moves = math.ceil((current_board.size ** 2 - num_disks) / 2)
+            self.search_algorithm.max_time = self.time_manager.allocate(num_remaining_moves)
+
+        start_time = time.perf_counter()
+        position, self.last_search_statistics = self.search_algorithm.search(current_node)
+        if self.time_manager is not None:
+            self.time_manager.consume(time.perf_counter() - start_time)
+        return position
@@ -1,24 +1,119 @@
-from typing import Any
+from typing import Any, Dict, List, NamedTuple, Optional
+from multiprocessing.synchronize import Event
 import random
 import math
-from .time_limit import set_start_time, quit_when_time_over
+from .search_budget import SearchBudget, SearchBudgetExhausted
 from .tree_node import Action, TreeNode, NodeEvaluator, ScoredAction
 from .search_algorithm import SearchAlgorithm
+from .search_statistics import SearchIteration, SearchStatistics
+from .transposition_table import TranspositionTable, Bound
+from .move_ordering import MoveOrdering
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class RootActionResult(NamedTuple):
+    score: float
+    principal_variation: List[Action]
+    num_searched_nodes: int
+    # whether the score may change by searching deeper
+    reached_depth_limit: bool
+    # the lower end of the window the action is searched with
+    alpha: float = -math.inf
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether the score is exact rather than an upper bound by failing low."""
+        return self.score > self.alpha
+
+
+def _get_hash_key(node: TreeNode) -> Optional[int]:
+    try:
+        return node.hash_key
+    except NotImplementedError:
+        return None
+
+
 @SearchAlgorithm.register("min_max")
 class MinMaxSearch(SearchAlgorithm):
-    def __init__(self, node_evaluator: NodeEvaluator, max_depth: int = 100, max_time: float = None):
+    """
+    Iterative deepening min-max search in the negamax formulation with alpha-beta pruning.
+    Scores are from the perspective of the playing side (the side for which `is_opponent_turn` is False).
+    Alpha-beta pruning does not change the results and can be disabled to compare the number of searched nodes.
+    The search stops when it runs out of `max_time` or `max_num_nodes`, and returns the best action of
+    the last completed iteration, or of the unfinished iteration if any root action has been searched in it.
+    If `transposition_table_size_mb` is given, search results are cached by `TreeNode.hash_key`.
+    The transposition table and the move ordering statistics are kept across searches,
+    and a search starts from the rest of the previous principal variation if the opponent replied as expected.
+    If `move_ordering` is given, actions are ordered by it (see `MoveOrdering`),
+    otherwise they are searched in the order of `get_valid_actions` except for the transposition table move.
+    Each iteration searches the root actions in the order of their scores in the previous iteration.
+    If `aspiration_window` is given, each iteration first searches within the window around the previous score,
+    and re-searches with a full window only when the score falls outside of it.
+    """
+
+    def __init__(
+        self,
+        node_evaluator: NodeEvaluator,
+        max_depth: int = 100,
+        max_time: float = None,
+        max_num_nodes: int = None,
+        use_alpha_beta: bool = True,
+        transposition_table_size_mb: float = None,
+        move_ordering: MoveOrdering = None,
+        aspiration_window: float = None,
+    ):
         self.node_evaluator = node_evaluator
         self.max_depth = max_depth
         self.max_time = max_time
-        self._start_time = 0
+        self.max_num_nodes = max_num_nodes
+        self.use_alpha_beta = use_alpha_beta
+        # set to stop the search from another process, e.g., by `PonderingSearch`
+        self.stop_event: Optional[Event] = None
+        self._budget = SearchBudget()
+
+        self.transposition_table = None
+        if transposition_table_size_mb is not None:
+            self.transposition_table = TranspositionTable(transposition_table_size_mb)
+
+        self.move_ordering = move_ordering
+        self.aspiration_window = aspiration_window
+
+        # the principal variation found by the last completed iteration
+        self.principal_variation: List[Action] = []
+        # the principal variations from each ply found in the current iteration
+        self._pv_lines: Dict[int, List[Action]] = {}
+        self._is_following_pv = False
+
+        # the number of nodes visited, evaluated by `node_evaluator` and cut off in the last search
+        self.num_searched_nodes = 0
+        self.num_leaf_evaluations = 0
+        self.num_cutoffs = 0
+        # the results of the completed iterations of the last search
+        self.iterations: List[SearchIteration] = []
+        # the scores of the root actions in the last completed iteration, used to order the next one
+        self._root_action_scores: Dict[Action, float] = {}
+        self._reached_depth_limit = False
+        # the best root action so far in the current iteration, used if the search runs out of the budget
+        self._partial_scored_action: Optional[ScoredAction] = None
+        # the position expected in the next search and the rest of the principal variation from there
+        self._expected_hash_key: Optional[int] = None
+        self._expected_principal_variation: List[Action] = []
 
-    @set_start_time
     def search_best_action(self, current_node: TreeNode) -> Action:
+        self._budget = SearchBudget(self.max_time, self.max_num_nodes, self.stop_event)
+        self.num_searched_nodes = 0
+        self.num_leaf_evaluations = 0
+        self.num_cutoffs = 0
+        # start from the rest of the previous principal variation if the opponent replied as expected
+        self.principal_variation = []
+        if self._expected_hash_key is not None and self._expected_hash_key == _get_hash_key(current_node):
+            self.principal_variation = self._expected_principal_variation
+        self.iterations = []
+        self._root_action_scores = {}
+        self.new_search()
+
         # randomly choice an action in case that cannot perform search within the time
         action = random.choice(current_node.get_valid_actions())
         best_scored_action = ScoredAction(action, -math.inf)
@@ -28,43 +123,309 @@ class MinMaxSearch(SearchAlgorithm):
             max_depth = 1
             while max_depth <= self.max_depth:
                 logger.info(f"Searching depth {max_depth}...")
-                best_scored_action = self._search_best_action_by_depth(current_node, max_depth=max_depth)
-                if abs(best_scored_action.score) == math.inf:
+                self._reached_depth_limit = False
+                if self.aspiration_window is not None and self.iterations:
+                    best_scored_action = self._search_with_aspiration_window(
+                        current_node, max_depth, previous_score=best_scored_action.score
+                    )
+                else:
+                    best_scored_action = self._search_best_action_by_depth(current_node, max_depth=max_depth)
+                self.principal_variation = self._pv_lines[0]
+
+                iteration = SearchIteration(
+                    depth=max_depth,
+                    score=best_scored_action.score,
+                    best_action=best_scored_action.action,
+                    num_searched_nodes=self.num_searched_nodes,
+                    elapsed_time=self._budget.elapsed_time,
+                )
+                self.iterations.append(iteration)
+                logger.info(
+                    f"Depth {iteration.depth}: score {iteration.score}, "
+                    f"nodes {iteration.num_searched_nodes}, time {iteration.elapsed_time:.3f}s"
+                )
+
+                # searching deeper gives the same result if no leaf was cut off by the depth limit
+                if not self._reached_depth_limit:
                     break
                 max_depth += 1
-        except TimeoutError:
-            logger.info(f"Run out of time.")
+        except SearchBudgetExhausted:
+            logger.info(f"Run out of the budget.")
+            # the actions searched in the unfinished iteration are searched deeper than the completed ones
+            if self._partial_scored_action is not None:
+                logger.info(f"Using the partial result of depth {max_depth}.")
+                best_scored_action = self._partial_scored_action
+                self.principal_variation = self._pv_lines[0]
+
+        self._expect_next_search(current_node)
 
         logger.info(f"Evaluated score: {best_scored_action.score}")
+        logger.info(f"Searched nodes: {self.num_searched_nodes}")
+        if self.transposition_table is not None:
+            logger.info(
+                f"Transposition table hit rate: {self.transposition_table.hit_rate:.3f}, "
+                f"occupancy: {self.transposition_table.occupancy:.3f}"
+            )
 
         return best_scored_action.action
 
-    def _search_best_action_by_depth(self, current_node: TreeNode, max_depth: int) -> ScoredAction:
+    def get_statistics(self, elapsed_time: float) -> SearchStatistics:
+        transposition_table = self.transposition_table
+        return SearchStatistics(
+            elapsed_time=elapsed_time,
+            num_searched_nodes=self.num_searched_nodes,
+            num_leaf_evaluations=self.num_leaf_evaluations,
+            num_cutoffs=self.num_cutoffs,
+            num_transposition_table_probes=0 if transposition_table is None else transposition_table.num_probes,
+            num_transposition_table_hits=0 if transposition_table is None else transposition_table.num_hits,
+            iterations=tuple(self.iterations),
+        )
+
+    def new_search(self):
+        """Age the tables kept from the previous searches."""
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+        if self.move_ordering is not None:
+            self.move_ordering.new_search()
+
+    def search_root_action(
+        self, current_node: TreeNode, action: Action, max_depth: int, alpha: float = -math.inf
+    ) -> RootActionResult:
+        """
+        Search a single root action to `max_depth` within the window (alpha, inf), e.g., in a parallel search.
+        The score is an upper bound not greater than alpha if the action is not better than alpha.
+        Raise `SearchBudgetExhausted` when running out of the budget.
+        """
+        self._budget = SearchBudget(self.max_time, self.max_num_nodes, self.stop_event)
+        self.num_searched_nodes = 0
+        self.num_leaf_evaluations = 0
+        self.num_cutoffs = 0
+        self._pv_lines = {}
+        self._is_following_pv = False
+        self._reached_depth_limit = False
+        score = self._search_action(current_node, action, max_depth, alpha, math.inf, ply=0, is_first_action=True)
+        return RootActionResult(
+            score=score,
+            principal_variation=[action] + self._pv_lines.get(1, []),
+            num_searched_nodes=self.num_searched_nodes,
+            reached_depth_limit=self._reached_depth_limit,
+            alpha=alpha,
+        )
+
+    def _expect_next_search(self, current_node: TreeNode):
+        """Remember the position after the first two moves of the principal variation to reuse it in the next search."""
+        self._expected_hash_key = None
+        self._expected_principal_variation = self.principal_variation[2:]
+        if len(self.principal_variation) < 2:
+            return
+        undo_tokens = [current_node.make_move(action) for action in self.principal_variation[:2]]
+        try:
+            self._expected_hash_key = _get_hash_key(current_node)
+        finally:
+            for undo_token in reversed(undo_tokens):
+                current_node.unmake_move(undo_token)
+
+    def _search_with_aspiration_window(
+        self, current_node: TreeNode, max_depth: int, previous_score: float
+    ) -> ScoredAction:
+        """
+        Search within a narrow window around the score of the previous iteration,
+        and re-search with the window opened to the failed side if the score falls outside of it.
+        """
+        alpha = previous_score - self.aspiration_window
+        beta = previous_score + self.aspiration_window
+        while True:
+            best_scored_action = self._search_best_action_by_depth(current_node, max_depth, alpha=alpha, beta=beta)
+            if best_scored_action.score <= alpha:
+                logger.info(f"Failed low at depth {max_depth}, re-searching...")
+                alpha = -math.inf
+            elif best_scored_action.score >= beta:
+                logger.info(f"Failed high at depth {max_depth}, re-searching...")
+                beta = math.inf
+            else:
+                return best_scored_action
+
+    def _search_best_action_by_depth(
+        self, current_node: TreeNode, max_depth: int, alpha: float = -math.inf, beta: float = math.inf
+    ) -> ScoredAction:
+        """
+        Search the actions of the root within the window (alpha, beta).
+        If no action scores within the window, the returned score is a bound beyond it.
+        """
         assert max_depth > 0
+        self._pv_lines = {0: []}
+        self._is_following_pv = True
+
+        actions = self._order_actions(current_node, current_node.get_valid_actions(), ply=0)
+        if self._root_action_scores:
+            # the scores of the previous iteration are the best guide to order the root actions,
+            # sorting is stable so the principal variation move stays in front of equally scored ones
+            root_action_scores = self._root_action_scores
+            actions = sorted(actions, key=lambda action: -root_action_scores.get(action, -math.inf))
+
+        root_action_scores = {}
         best_scored_action = ScoredAction(None, -math.inf)
-        for a in current_node.get_valid_actions():
-            score = self.evaluate_move(a, current_node, current_depth=0, max_depth=max_depth)
-            best_scored_action = max(best_scored_action, ScoredAction(a, score), key=lambda x: x.score)
+        self._partial_scored_action = None
+        for a in actions:
+            # moves that cannot be better than the current best are cut off and only get an upper bound,
+            # which never replaces the best action
+            score = self._search_action(
+                current_node,
+                a,
+                depth=max_depth,
+                alpha=max(alpha, best_scored_action.score),
+                beta=beta,
+                ply=0,
+                is_first_action=best_scored_action.action is None,
+            )
+            root_action_scores[a] = score
+            if score > best_scored_action.score or best_scored_action.action is None:
+                best_scored_action = ScoredAction(a, score)
+                self._pv_lines[0] = [a] + self._pv_lines.get(1, [])
+                if score > alpha:
+                    self._partial_scored_action = best_scored_action
+            if score >= beta:
+                break
+        # only a completed search of the root updates the ordering of the next iteration
+        if alpha < best_scored_action.score < beta:
+            self._root_action_scores = root_action_scores
         return best_scored_action
 
-    @quit_when_time_over
-    def evaluate_move(self, action: Any, current_node: TreeNode, current_depth: int, max_depth: int) -> float:
+    def _order_actions(self, node: TreeNode, actions: List[Action], ply: int, hash_action: Action = None):
+        pv_action = None
+        if self._is_following_pv and ply < len(self.principal_variation):
+            pv_action = self.principal_variation[ply]
+
+        if self.move_ordering is not None:
+            return self.move_ordering.order(node, actions, ply, pv_action=pv_action, hash_action=hash_action)
+
+        if hash_action is not None and hash_action in actions:
+            actions = [hash_action] + [action for action in actions if action != hash_action]
+        return actions
+
+    def _make_move_on_pv(self, node: TreeNode, action: Action, ply: int) -> Any:
+        """Make the move while keeping track of whether the search is on the previous principal variation."""
+        self._is_following_pv = (
+            self._is_following_pv
+            and ply < len(self.principal_variation)
+            and self.principal_variation[ply] == action
+        )
+        return node.make_move(action)
+
+    def evaluate_move(
+        self,
+        action: Any,
+        current_node: TreeNode,
+        current_depth: int,
+        max_depth: int,
+        alpha: float = -math.inf,
+        beta: float = math.inf,
+    ) -> float:
+        """
+        Return the score of the action from the perspective of the playing side.
+        The score is exact if it is within (alpha, beta), otherwise it is a bound beyond the window.
+        """
         assert current_depth < max_depth, f"{current_depth} < {max_depth}"
         assert not current_node.is_terminal
 
-        next_node = current_node.get_next_node(action)
-        next_depth = current_depth + 1
+        depth = max_depth - current_depth
+        if current_node.is_opponent_turn:
+            return -self._search_action(current_node, action, depth, -beta, -alpha, current_depth, is_first_action=True)
+        return self._search_action(current_node, action, depth, alpha, beta, current_depth, is_first_action=True)
+
+    def _search_action(
+        self, node: TreeNode, action: Action, depth: int, alpha: float, beta: float, ply: int, is_first_action: bool
+    ) -> float:
+        """
+        Return the score of the action from the perspective of the side to move at the node,
+        searching `depth` - 1 more plies after the action within the window (alpha, beta).
+        `is_first_action` tells whether the action is the first one searched at the node, which subclasses may use.
+        """
+        is_opponent_turn = node.is_opponent_turn
+        undo_token = self._make_move_on_pv(node, action, ply)
+        try:
+            if node.is_opponent_turn == is_opponent_turn:
+                # the same side moves again (e.g., the other side passed)
+                return self._negamax(node, depth - 1, alpha, beta, ply + 1)
+            return -self._negamax(node, depth - 1, -beta, -alpha, ply + 1)
+        finally:
+            node.unmake_move(undo_token)
+            self._is_following_pv = False
+
+    def _negamax(self, node: TreeNode, depth: int, alpha: float, beta: float, ply: int) -> float:
+        """
+        Return the score of the node from the perspective of the side to move,
+        searching `depth` more plies within the window (alpha, beta).
+        `ply` is the distance from the root.
+        """
+        self.num_searched_nodes += 1
+        if self.num_searched_nodes >= self._budget.next_check_num_nodes:
+            self._budget.check(self.num_searched_nodes)
+        self._pv_lines[ply] = []
+        # track whether this subtree reaches the depth limit separately from the rest of the search
+        outer_reached_depth_limit = self._reached_depth_limit
+        self._reached_depth_limit = False
+
+        transposition_table = self.transposition_table
+        hash_action = None
+        if transposition_table is not None:
+            hash_key = node.hash_key
+            entry = transposition_table.probe(hash_key)
+            if entry is not None:
+                # a result that does not depend on the depth limit holds for any depth
+                if entry.depth >= depth or not entry.is_depth_limited:
+                    self._reached_depth_limit = entry.is_depth_limited
+                    if entry.bound == Bound.EXACT:
+                        self._reached_depth_limit |= outer_reached_depth_limit
+                        return entry.score
+                    elif entry.bound == Bound.LOWER:
+                        alpha = max(alpha, entry.score)
+                    else:
+                        beta = min(beta, entry.score)
+                    if alpha >= beta:
+                        self._reached_depth_limit |= outer_reached_depth_limit
+                        return entry.score
+                # the best action found before is likely to cause a cutoff
+                hash_action = entry.best_action
+
+        if depth == 0 or node.is_terminal:
+            is_depth_limited = not node.is_terminal
+            score = self.node_evaluator(node)
+            self.num_leaf_evaluations += 1
+            if node.is_opponent_turn:
+                score = -score
+            if transposition_table is not None:
+                transposition_table.store(hash_key, depth, Bound.EXACT, score, None, is_depth_limited)
+            self._reached_depth_limit = outer_reached_depth_limit or is_depth_limited
+            return score
+
+        valid_actions = self._order_actions(node, node.get_valid_actions(), ply, hash_action=hash_action)
+
+        original_alpha = alpha
+        best_score = -math.inf
+        best_action = None
+        for action in valid_actions:
+            score = self._search_action(node, action, depth, alpha, beta, ply, is_first_action=best_action is None)
+
+            if score > best_score:
+                best_score = score
+                best_action = action
+                if best_score > alpha:
+                    alpha = best_score
+                    self._pv_lines[ply] = [action] + self._pv_lines.get(ply + 1, [])
+            if self.use_alpha_beta and alpha >= beta:
+                self.num_cutoffs += 1
+                if self.move_ordering is not None:
+                    self.move_ordering.update_by_cutoff(node, action, ply, depth)
+                break
 
-        if next_depth == max_depth or next_node.is_terminal:
-            best_score = self.node_evaluator(next_node)
-        else:
-            if next_node.is_opponent_turn:
-                best_score = math.inf
-                eval_func = min
+        if transposition_table is not None:
+            if best_score <= original_alpha:
+                bound = Bound.UPPER
+            elif best_score >= beta:
+                bound = Bound.LOWER
             else:
-                best_score = -math.inf
-                eval_func = max
-            for next_possible_action in next_node.get_valid_actions():
-                score = self.evaluate_move(next_possible_action, next_node, next_depth, max_depth)
-                best_score = eval_func(best_score, score)
+                bound = Bound.EXACT
+            transposition_table.store(hash_key, depth, bound, best_score, best_action, self._reached_depth_limit)
+        self._reached_depth_limit |= outer_reached_depth_limit
         return best_score
@@ -1,10 +1,11 @@
-from typing import List, Dict
+from typing import Dict
+import math
 import random
-import time
 
 from .search_algorithm import SearchAlgorithm
-from .tree_node import TreeNode, Action, NodeEvaluator
-from .time_limit import set_start_time, quit_when_time_over
+from .tree_node import TreeNode, Action, ActionStatistics, NodeEvaluator
+from .search_budget import SearchBudget
+from .search_statistics import SearchStatistics
 
 import logging
 
@@ -13,45 +14,74 @@ logger = logging.getLogger(__name__)
 
 @SearchAlgorithm.register("monte_carlo")
 class MonteCarloSearch(SearchAlgorithm):
-    def __init__(self, node_evaluator: NodeEvaluator, max_time: float = None, max_num_playouts: int = 10000):
+    def __init__(
+        self, node_evaluator: NodeEvaluator, max_time: float = None, max_num_playouts: int = 10000, seed: int = None
+    ):
         self.node_evaluator = node_evaluator
         self.max_time = max_time
         self.max_num_playouts = max_num_playouts
-        self._start_time = 0
+        self._random = random.Random(seed)
+
+        self.num_playouts = 0
+
+    def set_seed(self, seed: int):
+        self._random.seed(seed)
 
-    @set_start_time
     def search_best_action(self, current_node: TreeNode) -> Action:
-        self._start_time = time.time()
+        return self.choose_action(self.search_root_statistics(current_node))
+
+    def search_root_statistics(self, current_node: TreeNode) -> Dict[Action, ActionStatistics]:
+        budget = SearchBudget(self.max_time, max_num_nodes=self.max_num_playouts)
         valid_actions = current_node.get_valid_actions()
-        # randomly choice an action in case that cannot perform search within the time
+        num_visits = {action: 0 for action in valid_actions}
+        value_sums = {action: 0.0 for action in valid_actions}
 
-        playout_scores_for_actions: Dict[Action, List[float]] = {action: [] for action in valid_actions}
+        self.num_playouts = 0
+        while not budget.is_exhausted(self.num_playouts):
+            action = self._random.choice(valid_actions)
+            undo_token = current_node.make_move(action)
+            try:
+                score = self.playout(current_node)
+            finally:
+                current_node.unmake_move(undo_token)
+            num_visits[action] += 1
+            value_sums[action] += score
+            self.num_playouts += 1
 
-        try:
-            for num_playouts in range(self.max_num_playouts):
-                action = random.choice(valid_actions)
-                score = self.playout(current_node.get_next_node(action))
-                playout_scores_for_actions[action].append(score)
-        except TimeoutError:
-            logger.info(f"Run out of time.")
+        logger.info(f"Number of playouts: {self.num_playouts}")
+        return {action: ActionStatistics(num_visits[action], value_sums[action]) for action in valid_actions}
 
-        logger.info(f"Number of playouts: {num_playouts}")
+    def get_statistics(self, elapsed_time: float) -> SearchStatistics:
+        return SearchStatistics(
+            elapsed_time=elapsed_time, num_leaf_evaluations=self.num_playouts, num_playouts=self.num_playouts
+        )
 
-        average_score_for_actions = {
-            action: sum(scores) / len(scores) for action, scores in playout_scores_for_actions.items() if scores
+    def choose_action(self, statistics: Dict[Action, ActionStatistics]) -> Action:
+        """Choose the action with the best average score."""
+        # actions without playouts are chosen only when no playout is performed within the time
+        average_scores = {
+            action: statistic.value_sum / statistic.num_visits if statistic.num_visits else -math.inf
+            for action, statistic in statistics.items()
         }
-        best_action, best_score = max(average_score_for_actions.items(), key=lambda x: x[1])
+        best_action = max(average_scores, key=average_scores.get)
 
-        logger.info(f"Evaluated score: {best_score}")
+        logger.info(f"Evaluated score: {average_scores[best_action]}")
 
         return best_action
 
-    @quit_when_time_over
     def playout(self, start_node: TreeNode) -> float:
-        current_node = start_node
-        while not current_node.is_terminal:
-            actions = current_node.get_valid_actions()
-            action = random.choice(actions)
-            current_node = current_node.get_next_node(action)
+        """
+        Play randomly until the end of the game.
+        `start_node` is moved forward in place and restored to its original state before returning.
+        """
+        undo_tokens = []
+        try:
+            while not start_node.is_terminal:
+                actions = start_node.get_valid_actions()
+                action = self._random.choice(actions)
+                undo_tokens.append(start_node.make_move(action))
 
-        return self.node_evaluator(current_node)
+            return self.node_evaluator(start_node)
+        finally:
+            for undo_token in reversed(undo_tokens):
+                start_node.unmake_move(undo_token)
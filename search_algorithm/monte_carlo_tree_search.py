@@ -0,0 +1,250 @@
+from typing import Any, Dict, List, Optional
+import math
+import random
+
+from .search_algorithm import SearchAlgorithm
+from .min_max_search import _get_hash_key
+from .tree_node import TreeNode, Action, ActionStatistics, NodeEvaluator
+from .search_budget import SearchBudget
+from .search_statistics import SearchStatistics
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+SELECTION_RULES = ["ucb1", "puct"]
+
+# how many plies below the previous root to look for the current position when reusing the tree
+MAX_REUSE_DEPTH = 2
+
+
+class MonteCarloTreeNode:
+    """
+    Statistics of a node in the search tree.
+    `value_sum` is accumulated from the perspective of the side that made the action leading to this node.
+    """
+
+    __slots__ = (
+        "action",
+        "prior",
+        "is_opponent_move",
+        "visit_count",
+        "value_sum",
+        "children",
+        "is_terminal",
+        "hash_key",
+    )
+
+    def __init__(self, action: Action, prior: float, is_opponent_move: bool):
+        self.action = action
+        self.prior = prior
+        self.is_opponent_move = is_opponent_move
+        self.visit_count = 0
+        self.value_sum = 0.0
+        # None until the node is expanded
+        self.children: Optional[List["MonteCarloTreeNode"]] = None
+        self.is_terminal = False
+        # the hash key of the position, set on expansion when the tree is reused
+        self.hash_key: Optional[int] = None
+
+    @property
+    def is_expanded(self) -> bool:
+        return self.children is not None
+
+    @property
+    def mean_value(self) -> float:
+        return self.value_sum / self.visit_count if self.visit_count else 0.0
+
+    def get_child(self, action: Action) -> Optional["MonteCarloTreeNode"]:
+        for child in self.children or []:
+            if child.action == action:
+                return child
+        return None
+
+
+@SearchAlgorithm.register("mcts")
+class MonteCarloTreeSearch(SearchAlgorithm):
+    """
+    Monte Carlo tree search.
+    Each playout selects actions down the tree by `selection` ("ucb1" or "puct"), expands the first node
+    that has not been expanded, plays randomly from there until the end of the game,
+    and backpropagates the score given by `node_evaluator` along the path.
+    Scores are from the perspective of the playing side, and are negated for the actions of the opponent.
+    The most visited action at the root is chosen.
+    If `reuse_tree` is True, the subtree of the position to search is kept from the previous search
+    (found by `TreeNode.hash_key` within `MAX_REUSE_DEPTH` plies), and the rest of the tree is discarded.
+    Nodes that do not implement `hash_key` are searched from a new tree every time.
+    """
+
+    def __init__(
+        self,
+        node_evaluator: NodeEvaluator,
+        max_time: float = None,
+        max_num_playouts: int = 10000,
+        exploration_constant: float = 1.4,
+        selection: str = "ucb1",
+        seed: int = None,
+        reuse_tree: bool = True,
+    ):
+        if selection not in SELECTION_RULES:
+            raise ValueError(f"selection must be one of {SELECTION_RULES}, but got {selection}.")
+
+        self.node_evaluator = node_evaluator
+        self.max_time = max_time
+        self.max_num_playouts = max_num_playouts
+        self.exploration_constant = exploration_constant
+        self.selection = selection
+        self.reuse_tree = reuse_tree
+        self._random = random.Random(seed)
+
+        # the tree built by the last search
+        self.root: Optional[MonteCarloTreeNode] = None
+        self.num_playouts = 0
+
+    def set_seed(self, seed: int):
+        self._random.seed(seed)
+
+    def search_best_action(self, current_node: TreeNode) -> Action:
+        return self.choose_action(self.search_root_statistics(current_node))
+
+    def search_root_statistics(self, current_node: TreeNode) -> Dict[Action, ActionStatistics]:
+        budget = SearchBudget(self.max_time, max_num_nodes=self.max_num_playouts)
+        self.root = self._find_subtree(current_node) if self.reuse_tree else None
+        if self.root is None:
+            self.root = MonteCarloTreeNode(None, 1.0, is_opponent_move=not current_node.is_opponent_turn)
+        else:
+            logger.info(f"Reusing the subtree with {self.root.visit_count} visits.")
+        if not self.root.is_expanded:
+            self._expand(self.root, current_node)
+        self.num_playouts = 0
+
+        while not budget.is_exhausted(self.num_playouts):
+            self.run_playout(current_node)
+
+        logger.info(f"Number of playouts: {self.num_playouts}")
+        return {child.action: ActionStatistics(child.visit_count, child.value_sum) for child in self.root.children}
+
+    def get_statistics(self, elapsed_time: float) -> SearchStatistics:
+        return SearchStatistics(
+            elapsed_time=elapsed_time, num_leaf_evaluations=self.num_playouts, num_playouts=self.num_playouts
+        )
+
+    def choose_action(self, statistics: Dict[Action, ActionStatistics]) -> Action:
+        """Choose the most visited action."""
+        best_action = max(statistics, key=lambda action: statistics[action].num_visits)
+        best_statistic = statistics[best_action]
+        mean_value = best_statistic.value_sum / best_statistic.num_visits if best_statistic.num_visits else 0.0
+        logger.info(f"Evaluated score: {mean_value} ({best_statistic.num_visits} visits)")
+        return best_action
+
+    def _find_subtree(self, current_node: TreeNode) -> Optional[MonteCarloTreeNode]:
+        """
+        Find the node of the current position in the tree of the previous search,
+        which is usually two plies (the previous action and the opponent's reply) below the previous root.
+        """
+        hash_key = _get_hash_key(current_node)
+        if self.root is None or hash_key is None:
+            # the tree cannot be reused without the hash keys of the nodes
+            return None
+        tree_nodes = [self.root]
+        for _ in range(MAX_REUSE_DEPTH + 1):
+            for tree_node in tree_nodes:
+                if tree_node.hash_key == hash_key and tree_node.is_expanded:
+                    return tree_node
+            tree_nodes = [child for tree_node in tree_nodes for child in tree_node.children or []]
+        return None
+
+    def run_playout(self, current_node: TreeNode):
+        """
+        Run one iteration of selection, expansion, simulation and backpropagation from the root.
+        `current_node` is moved forward in place and restored to its original state before returning.
+        """
+        tree_node = self.root
+        path = [tree_node]
+        undo_tokens = []
+        try:
+            while tree_node.is_expanded and not tree_node.is_terminal:
+                tree_node = self._select_child(tree_node)
+                undo_tokens.append(current_node.make_move(tree_node.action))
+                path.append(tree_node)
+
+            if not tree_node.is_expanded:
+                self._expand(tree_node, current_node)
+                if not tree_node.is_terminal:
+                    tree_node = self._select_child(tree_node)
+                    undo_tokens.append(current_node.make_move(tree_node.action))
+                    path.append(tree_node)
+
+            score = self.simulate(current_node)
+        finally:
+            for undo_token in reversed(undo_tokens):
+                current_node.unmake_move(undo_token)
+
+        self._backpropagate(path, score)
+
+    def _backpropagate(self, path: List[MonteCarloTreeNode], score: float):
+        for tree_node in path:
+            tree_node.visit_count += 1
+            tree_node.value_sum += -score if tree_node.is_opponent_move else score
+        self.num_playouts += 1
+
+    def _expand(self, tree_node: MonteCarloTreeNode, current_node: TreeNode, priors: List[float] = None):
+        """Add the children of `tree_node`, with `priors` of the valid actions if already computed."""
+        if self.reuse_tree:
+            tree_node.hash_key = _get_hash_key(current_node)
+        tree_node.is_terminal = current_node.is_terminal
+        if tree_node.is_terminal:
+            tree_node.children = []
+            return
+
+        actions = current_node.get_valid_actions()
+        if priors is None:
+            priors = self.get_priors(current_node, actions)
+        is_opponent_move = current_node.is_opponent_turn
+        tree_node.children = [
+            MonteCarloTreeNode(action, prior, is_opponent_move) for action, prior in zip(actions, priors)
+        ]
+        # unvisited children are tried in a random order
+        self._random.shuffle(tree_node.children)
+
+    def get_priors(self, current_node: TreeNode, actions: List[Action]) -> List[float]:
+        """The prior probabilities of the actions for PUCT. Uniform by default."""
+        return [1.0 / len(actions)] * len(actions)
+
+    def _select_child(self, tree_node: MonteCarloTreeNode) -> MonteCarloTreeNode:
+        exploration_constant = self.exploration_constant
+        if self.selection == "ucb1":
+            log_parent_visits = math.log(max(tree_node.visit_count, 1))
+            best_child = None
+            best_value = -math.inf
+            for child in tree_node.children:
+                if child.visit_count == 0:
+                    return child
+                value = child.value_sum / child.visit_count + exploration_constant * math.sqrt(
+                    log_parent_visits / child.visit_count
+                )
+                if value > best_value:
+                    best_child, best_value = child, value
+            return best_child
+
+        sqrt_parent_visits = math.sqrt(max(tree_node.visit_count, 1))
+        return max(
+            tree_node.children,
+            key=lambda child: child.mean_value
+            + exploration_constant * child.prior * sqrt_parent_visits / (1 + child.visit_count),
+        )
+
+    def simulate(self, start_node: TreeNode) -> float:
+        """
+        Play randomly until the end of the game and return the score from the perspective of the playing side.
+        `start_node` is moved forward in place and restored to its original state before returning.
+        """
+        undo_tokens: List[Any] = []
+        try:
+            while not start_node.is_terminal:
+                action = self._random.choice(start_node.get_valid_actions())
+                undo_tokens.append(start_node.make_move(action))
+            return self.node_evaluator(start_node)
+        finally:
+            for undo_token in reversed(undo_tokens):
+                start_node.unmake_move(undo_token)
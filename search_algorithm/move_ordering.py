@@ -0,0 +1,83 @@
+from typing import Dict, List, Tuple
+from collections import defaultdict
+
+from registrable import Registrable, FromParams
+from .tree_node import Action, TreeNode
+
+
+class StaticMoveOrderer(Registrable):
+    """Domain-specific ordering of actions that only looks at the node."""
+
+    def __call__(self, node: TreeNode, actions: List[Action]) -> List[Action]:
+        raise NotImplementedError
+
+
+class MoveOrdering(FromParams):
+    """
+    Orders the actions of a node to search the likely best ones first, which makes alpha-beta pruning effective.
+    The actions are ordered as follows:
+        1. the move of the principal variation of the previous iteration
+        2. the best move stored in the transposition table
+        3. the killer moves, which caused a cutoff at the same ply
+        4. the other moves, in the descending order of the history heuristic, and then of the static orderer
+    """
+
+    def __init__(
+        self,
+        use_pv_move: bool = True,
+        use_killer_moves: bool = True,
+        use_history_heuristic: bool = True,
+        num_killer_moves: int = 2,
+        static_move_orderer: StaticMoveOrderer = None,
+    ):
+        self.use_pv_move = use_pv_move
+        self.use_killer_moves = use_killer_moves
+        self.use_history_heuristic = use_history_heuristic
+        self.num_killer_moves = num_killer_moves
+        self.static_move_orderer = static_move_orderer
+
+        self.killer_moves: Dict[int, List[Action]] = defaultdict(list)
+        self.history: Dict[Tuple[bool, Action], int] = defaultdict(int)
+
+    def new_search(self):
+        self.killer_moves.clear()
+        # keep the history from the previous searches with less weight
+        for key in self.history:
+            self.history[key] //= 2
+
+    def order(
+        self, node: TreeNode, actions: List[Action], ply: int, pv_action: Action = None, hash_action: Action = None
+    ) -> List[Action]:
+        if self.static_move_orderer is not None:
+            actions = self.static_move_orderer(node, actions)
+
+        if self.use_history_heuristic:
+            is_opponent_turn = node.is_opponent_turn
+            history = self.history
+            # sorting is stable, so actions with the same history keep the static order
+            actions = sorted(actions, key=lambda action: -history.get((is_opponent_turn, action), 0))
+
+        first_actions = []
+        if self.use_pv_move and pv_action is not None:
+            first_actions.append(pv_action)
+        if hash_action is not None:
+            first_actions.append(hash_action)
+        if self.use_killer_moves:
+            first_actions += self.killer_moves.get(ply, [])
+
+        ordered_actions = [action for action in dict.fromkeys(first_actions) if action in actions]
+        if ordered_actions:
+            ordered_actions += [action for action in actions if action not in ordered_actions]
+            return ordered_actions
+        return actions
+
+    def update_by_cutoff(self, node: TreeNode, action: Action, ply: int, depth: int):
+        """Update the killer moves and the history with the action that caused a cutoff."""
+        if self.use_killer_moves:
+            killer_moves = self.killer_moves[ply]
+            if action not in killer_moves:
+                killer_moves.insert(0, action)
+                del killer_moves[self.num_killer_moves :]
+
+        if self.use_history_heuristic:
+            self.history[(node.is_opponent_turn, action)] += depth * depth
@@ -0,0 +1,139 @@
+from typing import List, Optional
+from multiprocessing.connection import Connection
+from multiprocessing.synchronize import Event
+import multiprocessing
+
+from .search_algorithm import SearchAlgorithm
+from .tree_node import TreeNode, Action
+from .min_max_search import MinMaxSearch, _get_hash_key
+from .search_statistics import SearchIteration, SearchStatistics
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _run_worker(connection: Connection, search_algorithm: MinMaxSearch, stop_event: Event):
+    """
+    Serve searches until receiving None.
+    Each request is (node, max_time, is_pondering), and is answered with
+    (action, principal variation, `SearchStatistics`).
+    Pondering searches have no time limit and run until `stop_event` is set.
+    """
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        node, max_time, is_pondering = request
+        search_algorithm.max_time = None if is_pondering else max_time
+        search_algorithm.stop_event = stop_event if is_pondering else None
+        action, statistics = search_algorithm.search(node)
+        connection.send((action, search_algorithm.principal_variation, statistics))
+
+
+@SearchAlgorithm.register("pondering")
+class PonderingSearch(SearchAlgorithm):
+    """
+    Min-max search that keeps thinking on the opponent's time.
+    `search_algorithm` runs in a background process, and after each search it continues on the position
+    after the expected reply of the opponent (the second action of the principal variation)
+    until the next search is requested.
+    The transposition table and the move ordering statistics filled while pondering stay in the process,
+    so the next search reaches deeper quickly if the opponent replied as expected (a ponder hit),
+    and still reuses the shared positions otherwise.
+    The process is started on the first search and lives until `close` is called.
+    """
+
+    def __init__(self, search_algorithm: MinMaxSearch):
+        self.search_algorithm = search_algorithm
+
+        self.max_time = search_algorithm.max_time
+
+        self.principal_variation: List[Action] = []
+        self.iterations: List[SearchIteration] = []
+        self.num_searched_nodes = 0
+        self.num_ponder_hits = 0
+        # the statistics of the last search in the worker
+        self.statistics: Optional[SearchStatistics] = None
+        # the iterations completed while pondering on the position of the last search
+        self.ponder_iterations: List[SearchIteration] = []
+
+        self._process: Optional[multiprocessing.Process] = None
+        self._connection: Optional[Connection] = None
+        self._stop_event: Optional[Event] = None
+        self._is_pondering = False
+        self._pondered_hash_key: Optional[int] = None
+
+    def _start_worker(self):
+        self._connection, child_connection = multiprocessing.Pipe()
+        self._stop_event = multiprocessing.Event()
+        self._process = multiprocessing.Process(
+            target=_run_worker, args=(child_connection, self.search_algorithm, self._stop_event), daemon=True
+        )
+        self._process.start()
+
+    def close(self):
+        if self._process is None:
+            return
+        self._stop_pondering()
+        self._connection.send(None)
+        self._process.join()
+        self._process = None
+        self._connection = None
+
+    def __del__(self):
+        self.close()
+
+    def search_best_action(self, current_node: TreeNode) -> Action:
+        if self._process is None:
+            self._start_worker()
+
+        is_pondering = self._is_pondering
+        self.ponder_iterations = self._stop_pondering()
+        hash_key = _get_hash_key(current_node)
+        if is_pondering and hash_key is not None and hash_key == self._pondered_hash_key:
+            self.num_ponder_hits += 1
+            logger.info(f"Ponder hit: {len(self.ponder_iterations)} iterations completed while pondering.")
+        else:
+            self.ponder_iterations = []
+
+        self._connection.send((current_node, self.max_time, False))
+        action, self.principal_variation, self.statistics = self._connection.recv()
+        self.iterations = list(self.statistics.iterations)
+        self.num_searched_nodes = self.statistics.num_searched_nodes
+
+        self._start_pondering(current_node, action)
+        return action
+
+    def get_statistics(self, elapsed_time: float) -> SearchStatistics:
+        """The statistics of the search in the worker, excluding the time to communicate with it."""
+        return self.statistics
+
+    def _start_pondering(self, current_node: TreeNode, action: Action):
+        """Start searching the position after `action` and the expected reply, if the reply is known."""
+        if len(self.principal_variation) < 2 or self.principal_variation[0] != action:
+            return
+        undo_tokens = []
+        try:
+            for a in self.principal_variation[:2]:
+                undo_tokens.append(current_node.make_move(a))
+            if current_node.is_terminal:
+                return
+            self._pondered_hash_key = _get_hash_key(current_node)
+            self._stop_event.clear()
+            self._is_pondering = True
+            # the node is pickled when sent, so it can be restored right after
+            self._connection.send((current_node, None, True))
+        finally:
+            for undo_token in reversed(undo_tokens):
+                current_node.unmake_move(undo_token)
+        logger.info(f"Pondering on the expected reply {self.principal_variation[1]}...")
+
+    def _stop_pondering(self) -> List[SearchIteration]:
+        """Stop pondering if running, and return the iterations completed while pondering."""
+        if not self._is_pondering:
+            return []
+        self._stop_event.set()
+        _, _, statistics = self._connection.recv()
+        self._is_pondering = False
+        return list(statistics.iterations)
@@ -0,0 +1,54 @@
+import math
+
+from .tree_node import Action, TreeNode, NodeEvaluator
+from .search_algorithm import SearchAlgorithm
+from .min_max_search import MinMaxSearch
+from .move_ordering import MoveOrdering
+
+
+@SearchAlgorithm.register("pvs")
+class PrincipalVariationSearch(MinMaxSearch):
+    """
+    Principal variation search (NegaScout).
+    The first action of each node is searched with the full window, and the others only with a null window
+    to prove that they are not better than the first one. An action that turns out to be better is re-searched
+    with the full window.
+    This pays off when the actions are well ordered, so it should be used with `move_ordering`.
+    `null_window_width` should be the smallest meaningful difference of scores, e.g., 1 for integer scores.
+    """
+
+    def __init__(
+        self,
+        node_evaluator: NodeEvaluator,
+        max_depth: int = 100,
+        max_time: float = None,
+        max_num_nodes: int = None,
+        transposition_table_size_mb: float = None,
+        move_ordering: MoveOrdering = None,
+        aspiration_window: float = None,
+        null_window_width: float = 1e-6,
+    ):
+        super().__init__(
+            node_evaluator,
+            max_depth=max_depth,
+            max_time=max_time,
+            max_num_nodes=max_num_nodes,
+            use_alpha_beta=True,
+            transposition_table_size_mb=transposition_table_size_mb,
+            move_ordering=move_ordering,
+            aspiration_window=aspiration_window,
+        )
+        self.null_window_width = null_window_width
+
+    def _search_action(
+        self, node: TreeNode, action: Action, depth: int, alpha: float, beta: float, ply: int, is_first_action: bool
+    ) -> float:
+        if is_first_action or alpha == -math.inf or beta - alpha <= self.null_window_width:
+            return super()._search_action(node, action, depth, alpha, beta, ply, is_first_action)
+
+        score = super()._search_action(node, action, depth, alpha, alpha + self.null_window_width, ply, False)
+        if alpha < score < beta:
+            # the action is better than expected and the null window search only gave a lower bound,
+            # which the re-search can start from
+            score = max(score, super()._search_action(node, action, depth, score, beta, ply, False))
+        return score
@@ -0,0 +1,118 @@
+from typing import Dict, List
+from collections import defaultdict
+from multiprocessing.connection import Connection
+import math
+import multiprocessing
+import os
+import time
+
+from .search_algorithm import SearchAlgorithm
+from .tree_node import TreeNode, Action, ActionStatistics
+from .search_statistics import SearchStatistics
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _run_worker(connection: Connection, search_algorithm: SearchAlgorithm):
+    """
+    Serve searches until receiving None.
+    Each request is (node, seed, deadline, max_num_playouts) and is answered with
+    the root statistics and the number of playouts run in the search.
+    """
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        node, seed, deadline, max_num_playouts = request
+        search_algorithm.set_seed(seed)
+        if deadline is not None:
+            search_algorithm.max_time = max(deadline - time.time(), 0.0)
+        search_algorithm.max_num_playouts = max_num_playouts
+        statistics = search_algorithm.search_root_statistics(node)
+        connection.send((statistics, search_algorithm.num_playouts))
+
+
+@SearchAlgorithm.register("root_parallel")
+class RootParallelSearch(SearchAlgorithm):
+    """
+    Root parallelization of a Monte Carlo search (`MonteCarloSearch` or `MonteCarloTreeSearch`).
+    Each of `num_workers` processes keeps its own copy of `search_algorithm` and searches the same root
+    with a different seed, and the statistics of the root actions are summed up before choosing the action.
+    `max_time` of `search_algorithm` is the time for the whole search,
+    and `max_num_playouts` is split among the workers.
+    The workers are started on the first search and live until `close` is called.
+    """
+
+    def __init__(self, search_algorithm: SearchAlgorithm, num_workers: int = None, seed: int = 0):
+        self.search_algorithm = search_algorithm
+        self.num_workers = num_workers or os.cpu_count()
+        self.seed = seed
+
+        self.max_time = search_algorithm.max_time
+        self.max_num_playouts = search_algorithm.max_num_playouts
+        self.num_playouts = 0
+        self._num_searches = 0
+
+        self._processes: List[multiprocessing.Process] = []
+        self._connections: List[Connection] = []
+
+    def _start_workers(self):
+        for _ in range(self.num_workers):
+            parent_connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_run_worker, args=(child_connection, self.search_algorithm), daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+            self._connections.append(parent_connection)
+
+    def close(self):
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except OSError:
+                # the worker has already exited
+                pass
+        for process in self._processes:
+            process.join()
+        self._processes = []
+        self._connections = []
+
+    def __del__(self):
+        self.close()
+
+    def search_best_action(self, current_node: TreeNode) -> Action:
+        return self.search_algorithm.choose_action(self.search_root_statistics(current_node))
+
+    def get_statistics(self, elapsed_time: float) -> SearchStatistics:
+        return SearchStatistics(
+            elapsed_time=elapsed_time, num_leaf_evaluations=self.num_playouts, num_playouts=self.num_playouts
+        )
+
+    def search_root_statistics(self, current_node: TreeNode) -> Dict[Action, ActionStatistics]:
+        if not self._processes:
+            self._start_workers()
+
+        deadline = None if self.max_time is None else time.time() + self.max_time
+        max_num_playouts = math.ceil(self.max_num_playouts / self.num_workers)
+        # the node is sent once per worker and search, not per playout
+        for worker_index, connection in enumerate(self._connections):
+            seed = self.seed + self._num_searches * self.num_workers + worker_index
+            connection.send((current_node, seed, deadline, max_num_playouts))
+        self._num_searches += 1
+
+        num_visits = defaultdict(int)
+        value_sums = defaultdict(float)
+        # the visits of the root may include the ones reused from the previous searches
+        self.num_playouts = 0
+        for connection in self._connections:
+            statistics, num_playouts = connection.recv()
+            for action, statistic in statistics.items():
+                num_visits[action] += statistic.num_visits
+                value_sums[action] += statistic.value_sum
+            self.num_playouts += num_playouts
+
+        logger.info(f"Number of playouts of {self.num_workers} workers: {self.num_playouts}")
+        return {action: ActionStatistics(num_visits[action], value_sums[action]) for action in num_visits}
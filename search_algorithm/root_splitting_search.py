@@ -0,0 +1,187 @@
+from typing import Dict, List, Optional
+from multiprocessing.sharedctypes import Synchronized
+import math
+import multiprocessing
+import os
+import random
+import time
+
+from .search_algorithm import SearchAlgorithm
+from .tree_node import TreeNode, Action, ScoredAction
+from .min_max_search import MinMaxSearch, RootActionResult
+from .search_statistics import SearchIteration, SearchStatistics
+from .search_budget import SearchBudgetExhausted
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _run_worker(
+    task_queue: multiprocessing.Queue,
+    result_queue: multiprocessing.Queue,
+    search_algorithm: MinMaxSearch,
+    shared_alpha: Synchronized,
+):
+    """
+    Search root actions until receiving None.
+    Each task is (search id, node, action, depth, deadline), and is answered with
+    (search id, action, `RootActionResult`), where the result is None if the search ran out of time.
+    """
+    current_search_id = None
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        search_id, node, action, depth, deadline = task
+        if search_id != current_search_id:
+            search_algorithm.new_search()
+            current_search_id = search_id
+        if deadline is not None:
+            search_algorithm.max_time = max(deadline - time.time(), 0.0)
+
+        result = None
+        try:
+            result = search_algorithm.search_root_action(node, action, depth, alpha=shared_alpha.value)
+            with shared_alpha.get_lock():
+                shared_alpha.value = max(shared_alpha.value, result.score)
+        except SearchBudgetExhausted:
+            pass
+        result_queue.put((search_id, action, result))
+
+
+@SearchAlgorithm.register("root_splitting")
+class RootSplittingSearch(SearchAlgorithm):
+    """
+    Parallel iterative deepening min-max search that splits the root actions among `num_workers` processes,
+    each of which keeps its own copy of `search_algorithm` including the transposition table.
+    In each iteration, the first action (the best one in the previous iteration) is searched alone to get a bound,
+    and then the other actions are searched in parallel with the best score so far shared as alpha.
+    `max_depth` and `max_time` of `search_algorithm` apply to the whole search.
+    The workers are started on the first search and live until `close` is called.
+    """
+
+    def __init__(self, search_algorithm: MinMaxSearch, num_workers: int = None):
+        self.search_algorithm = search_algorithm
+        self.num_workers = num_workers or os.cpu_count()
+
+        self.max_depth = search_algorithm.max_depth
+        self.max_time = search_algorithm.max_time
+
+        self.principal_variation: List[Action] = []
+        self.iterations: List[SearchIteration] = []
+        self.num_searched_nodes = 0
+        self._num_searches = 0
+
+        self._processes: List[multiprocessing.Process] = []
+        self._task_queue: Optional[multiprocessing.Queue] = None
+        self._result_queue: Optional[multiprocessing.Queue] = None
+        self._shared_alpha: Optional[Synchronized] = None
+
+    def _start_workers(self):
+        self._task_queue = multiprocessing.Queue()
+        self._result_queue = multiprocessing.Queue()
+        self._shared_alpha = multiprocessing.Value("d", -math.inf)
+        for _ in range(self.num_workers):
+            process = multiprocessing.Process(
+                target=_run_worker,
+                args=(self._task_queue, self._result_queue, self.search_algorithm, self._shared_alpha),
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+
+    def close(self):
+        for _ in self._processes:
+            self._task_queue.put(None)
+        for process in self._processes:
+            process.join()
+        self._processes = []
+
+    def __del__(self):
+        self.close()
+
+    def search_best_action(self, current_node: TreeNode) -> Action:
+        if not self._processes:
+            self._start_workers()
+
+        start_time = time.time()
+        deadline = None if self.max_time is None else start_time + self.max_time
+        self._num_searches += 1
+        self.num_searched_nodes = 0
+        self.principal_variation = []
+        self.iterations = []
+
+        actions = current_node.get_valid_actions()
+        # randomly choice an action in case that cannot perform search within the time
+        best_scored_action = ScoredAction(random.choice(actions), -math.inf)
+
+        for max_depth in range(1, self.max_depth + 1):
+            logger.info(f"Searching depth {max_depth}...")
+            self._shared_alpha.value = -math.inf
+            # young brothers wait: the other actions are searched after the first one gives a bound
+            results = self._search_root_actions(current_node, actions[:1], max_depth, deadline)
+            if results is not None:
+                other_results = self._search_root_actions(current_node, actions[1:], max_depth, deadline)
+                results = None if other_results is None else {**results, **other_results}
+            if results is None:
+                logger.info(f"Run out of time.")
+                break
+
+            # a score that failed low is only an upper bound and may equal the best score while being worse,
+            # so the best action is chosen from the exact ones, which always include the first action
+            candidates = [action for action in actions if results[action].is_exact] or actions
+            # ties are broken by the order of the search as in the serial search
+            best_action = max(candidates, key=lambda action: (results[action].score, -actions.index(action)))
+            best_scored_action = ScoredAction(best_action, results[best_action].score)
+            self.principal_variation = results[best_action].principal_variation
+            # the actions are searched in the order of the scores in the next iteration
+            actions = sorted(actions, key=lambda action: -results[action].score)
+            actions.remove(best_action)
+            actions.insert(0, best_action)
+
+            self.iterations.append(
+                SearchIteration(
+                    depth=max_depth,
+                    score=best_scored_action.score,
+                    best_action=best_action,
+                    num_searched_nodes=self.num_searched_nodes,
+                    elapsed_time=time.time() - start_time,
+                )
+            )
+            logger.info(
+                f"Depth {max_depth}: score {best_scored_action.score}, nodes {self.num_searched_nodes}, "
+                f"time {time.time() - start_time:.3f}s"
+            )
+            if not any(result.reached_depth_limit for result in results.values()):
+                break
+
+        logger.info(f"Evaluated score: {best_scored_action.score}")
+        logger.info(f"Searched nodes of {self.num_workers} workers: {self.num_searched_nodes}")
+        return best_scored_action.action
+
+    def get_statistics(self, elapsed_time: float) -> SearchStatistics:
+        return SearchStatistics(
+            elapsed_time=elapsed_time, num_searched_nodes=self.num_searched_nodes, iterations=tuple(self.iterations)
+        )
+
+    def _search_root_actions(
+        self, node: TreeNode, actions: List[Action], max_depth: int, deadline: Optional[float]
+    ) -> Optional[Dict[Action, RootActionResult]]:
+        """Search the actions in the workers, and return None if any of them runs out of time."""
+        for action in actions:
+            self._task_queue.put((self._num_searches, node, action, max_depth, deadline))
+
+        results = {}
+        is_timed_out = False
+        while len(results) < len(actions):
+            search_id, action, result = self._result_queue.get()
+            if search_id != self._num_searches:
+                # a late result of the previous search
+                continue
+            results[action] = result
+            if result is None:
+                is_timed_out = True
+            else:
+                self.num_searched_nodes += result.num_searched_nodes
+        return None if is_timed_out else results
@@ -1,9 +1,22 @@
 from abc import abstractmethod
+import time
+
 from registrable import Registrable
 from .tree_node import TreeNode, Action
+from .search_statistics import SearchResult, SearchStatistics
 
 
 class SearchAlgorithm(Registrable):
     @abstractmethod
     def search_best_action(self, current_node: TreeNode) -> Action:
         raise NotImplementedError
+
+    def search(self, current_node: TreeNode) -> SearchResult:
+        """Search the best action and return it with the statistics of the search."""
+        start_time = time.perf_counter()
+        action = self.search_best_action(current_node)
+        return SearchResult(action, self.get_statistics(time.perf_counter() - start_time))
+
+    def get_statistics(self, elapsed_time: float) -> SearchStatistics:
+        """The statistics of the last search, to be filled with the counters that the algorithm tracks."""
+        return SearchStatistics(elapsed_time)
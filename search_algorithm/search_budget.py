@@ -0,0 +1,103 @@
+from typing import Optional
+from multiprocessing.synchronize import Event
+import math
+import time
+
+from registrable import FromParams
+
+# the clock is read about once in this period (in seconds) at most
+MAX_CHECK_PERIOD = 0.01
+# and once in this number of nodes at least
+MAX_CHECK_INTERVAL = 100000
+
+
+class SearchBudgetExhausted(TimeoutError):
+    pass
+
+
+class SearchBudget:
+    """
+    Limits of the time and the number of nodes (or playouts) of a search.
+    The clock is read only once in a number of nodes, which is adapted to the measured nodes per second
+    so that the time is checked about `MAX_CHECK_PERIOD` seconds (or 1% of `max_time` if shorter) apart.
+    Searches count their nodes and call `check` (or `is_exhausted`) only when the count reaches
+    `next_check_num_nodes`, so that it costs an integer comparison per node.
+    If `stop_event` is given, the budget is also exhausted when it is set, e.g., from another process.
+    """
+
+    def __init__(self, max_time: float = None, max_num_nodes: int = None, stop_event: Optional[Event] = None):
+        self.max_time = max_time
+        self.max_num_nodes = max_num_nodes
+        self.stop_event = stop_event
+        self._check_period = MAX_CHECK_PERIOD if max_time is None else min(MAX_CHECK_PERIOD, max_time / 100)
+        self.start()
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self._last_check_time = self.start_time
+        self._last_check_num_nodes = 0
+        self.next_check_num_nodes = 1
+
+    @property
+    def elapsed_time(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    def is_exhausted(self, num_nodes: int) -> bool:
+        if num_nodes < self.next_check_num_nodes:
+            return False
+        if self.max_num_nodes is not None and num_nodes >= self.max_num_nodes:
+            return True
+        if self.max_time is None and self.stop_event is None:
+            self.next_check_num_nodes = math.inf if self.max_num_nodes is None else self.max_num_nodes
+            return False
+        if self.stop_event is not None and self.stop_event.is_set():
+            return True
+
+        now = time.perf_counter()
+        if self.max_time is not None and now - self.start_time >= self.max_time:
+            return True
+
+        # estimate how many nodes are searched in the check period from the last interval
+        time_per_node = (now - self._last_check_time) / max(num_nodes - self._last_check_num_nodes, 1)
+        interval = MAX_CHECK_INTERVAL if time_per_node == 0 else int(self._check_period / time_per_node)
+        interval = max(1, min(interval, MAX_CHECK_INTERVAL))
+        if self.max_time is not None:
+            # do not overshoot the end of the time
+            remaining_nodes = int((self.max_time - (now - self.start_time)) / max(time_per_node, 1e-9))
+            interval = max(1, min(interval, remaining_nodes))
+
+        self.next_check_num_nodes = num_nodes + interval
+        if self.max_num_nodes is not None:
+            self.next_check_num_nodes = min(self.next_check_num_nodes, self.max_num_nodes)
+        self._last_check_time = now
+        self._last_check_num_nodes = num_nodes
+        return False
+
+    def check(self, num_nodes: int):
+        """Raise `SearchBudgetExhausted` if the budget is exhausted."""
+        if self.is_exhausted(num_nodes):
+            raise SearchBudgetExhausted
+
+
+class TimeManager(FromParams):
+    """
+    Splits the total time for a game across the remaining moves.
+    `safety_margin` is the fraction of the remaining time kept unused for the overhead outside of the search.
+    """
+
+    def __init__(self, total_time: float, safety_margin: float = 0.05, min_time_per_move: float = 0.001):
+        self.total_time = total_time
+        self.safety_margin = safety_margin
+        self.min_time_per_move = min_time_per_move
+        self.remaining_time = total_time
+
+    def reset(self):
+        self.remaining_time = self.total_time
+
+    def allocate(self, num_remaining_moves: int) -> float:
+        """Return the time for the current move when `num_remaining_moves` moves including it are left."""
+        available_time = self.remaining_time * (1 - self.safety_margin)
+        return max(self.min_time_per_move, available_time / max(num_remaining_moves, 1))
+
+    def consume(self, elapsed_time: float):
+        self.remaining_time -= elapsed_time
@@ -0,0 +1,86 @@
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import json
+
+from .tree_node import Action
+
+
+class SearchIteration(NamedTuple):
+    depth: int
+    score: float
+    best_action: Action
+    # the number of nodes and the time from the start of the search to the end of this iteration
+    num_searched_nodes: int
+    elapsed_time: float
+
+
+class SearchStatistics(NamedTuple):
+    """
+    Statistics of a search for tuning and profiling.
+    Counters that are not tracked by a search algorithm are left zero.
+    """
+
+    elapsed_time: float
+    num_searched_nodes: int = 0
+    # the number of calls of the node evaluator
+    num_leaf_evaluations: int = 0
+    # the number of beta cutoffs in alpha-beta search
+    num_cutoffs: int = 0
+    num_transposition_table_probes: int = 0
+    num_transposition_table_hits: int = 0
+    num_playouts: int = 0
+    # the completed iterations of iterative deepening
+    iterations: Tuple[SearchIteration, ...] = ()
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.num_searched_nodes / self.elapsed_time if self.elapsed_time > 0 else 0.0
+
+    @property
+    def playouts_per_second(self) -> float:
+        return self.num_playouts / self.elapsed_time if self.elapsed_time > 0 else 0.0
+
+    @property
+    def effective_branching_factor(self) -> Optional[float]:
+        """The ratio of the numbers of nodes searched in the last two iterations."""
+        if len(self.iterations) < 2:
+            return None
+        num_nodes = [0] + [iteration.num_searched_nodes for iteration in self.iterations[-3:]]
+        last_num_nodes, previous_num_nodes = num_nodes[-1] - num_nodes[-2], num_nodes[-2] - num_nodes[-3]
+        return last_num_nodes / previous_num_nodes if previous_num_nodes > 0 else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """A JSON serializable dictionary including the derived values."""
+        statistics = self._asdict()
+        statistics["iterations"] = [
+            {
+                "depth": iteration.depth,
+                "score": iteration.score,
+                "num_searched_nodes": iteration.num_searched_nodes,
+                "elapsed_time": iteration.elapsed_time,
+            }
+            for iteration in self.iterations
+        ]
+        statistics["nodes_per_second"] = self.nodes_per_second
+        statistics["playouts_per_second"] = self.playouts_per_second
+        statistics["effective_branching_factor"] = self.effective_branching_factor
+        return statistics
+
+
+class SearchResult(NamedTuple):
+    action: Action
+    statistics: SearchStatistics
+
+
+class JsonLinesStatisticsWriter:
+    """Append the statistics of each search to a JSON lines file with arbitrary fields such as the game index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a")
+
+    def write(self, statistics: SearchStatistics, **fields):
+        self._file.write(json.dumps({**fields, **statistics.to_dict()}) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,98 @@
+from typing import List, NamedTuple, Optional
+from enum import Enum, auto
+
+from .tree_node import Action
+
+# rough memory footprint of one entry in CPython (the tuple and the objects it holds)
+ENTRY_SIZE_BYTES = 200
+
+
+class Bound(Enum):
+    EXACT = auto()
+    # the score is a lower bound (the search failed high)
+    LOWER = auto()
+    # the score is an upper bound (the search failed low)
+    UPPER = auto()
+
+
+class TranspositionTableEntry(NamedTuple):
+    hash_key: int
+    depth: int
+    bound: Bound
+    score: float
+    best_action: Action
+    generation: int
+    # whether the result depends on a leaf cut off by the depth limit, i.e., the position is not solved
+    is_depth_limited: bool = True
+
+
+class TranspositionTable:
+    """
+    Fixed-size hash table of search results keyed by position hash.
+    Each bucket has two slots: a depth-preferred slot that keeps the deepest result of the current search,
+    and an always-replace slot that keeps the most recent result.
+    """
+
+    def __init__(self, size_mb: float):
+        self.num_buckets = max(1, int(size_mb * 2 ** 20 / (2 * ENTRY_SIZE_BYTES)))
+        # slot 2 * i is the depth-preferred slot and slot 2 * i + 1 is the always-replace slot of the bucket i
+        self._entries: List[Optional[TranspositionTableEntry]] = [None] * (2 * self.num_buckets)
+        self._num_filled_slots = 0
+        self.generation = 0
+
+        self.num_probes = 0
+        self.num_hits = 0
+
+    def new_search(self):
+        """Mark the entries so far as old so that they are replaced first."""
+        self.generation += 1
+        self.num_probes = 0
+        self.num_hits = 0
+
+    def clear(self):
+        self._entries = [None] * (2 * self.num_buckets)
+        self._num_filled_slots = 0
+
+    def probe(self, hash_key: int) -> Optional[TranspositionTableEntry]:
+        self.num_probes += 1
+        slot = 2 * (hash_key % self.num_buckets)
+        for entry in (self._entries[slot], self._entries[slot + 1]):
+            if entry is not None and entry.hash_key == hash_key:
+                self.num_hits += 1
+                return entry
+        return None
+
+    def store(
+        self, hash_key: int, depth: int, bound: Bound, score: float, best_action: Action, is_depth_limited: bool = True
+    ):
+        new_entry = TranspositionTableEntry(
+            hash_key, depth, bound, score, best_action, self.generation, is_depth_limited
+        )
+        slot = 2 * (hash_key % self.num_buckets)
+
+        depth_preferred_entry = self._entries[slot]
+        if (
+            depth_preferred_entry is None
+            or depth_preferred_entry.hash_key == hash_key
+            or depth_preferred_entry.generation != self.generation
+            or depth >= depth_preferred_entry.depth
+        ):
+            self._set_entry(slot, new_entry)
+            # move the replaced entry to the always-replace slot if it is of another position
+            if depth_preferred_entry is not None and depth_preferred_entry.hash_key != hash_key:
+                self._set_entry(slot + 1, depth_preferred_entry)
+        else:
+            self._set_entry(slot + 1, new_entry)
+
+    def _set_entry(self, slot: int, entry: TranspositionTableEntry):
+        if self._entries[slot] is None:
+            self._num_filled_slots += 1
+        self._entries[slot] = entry
+
+    @property
+    def hit_rate(self) -> float:
+        return self.num_hits / self.num_probes if self.num_probes else 0.0
+
+    @property
+    def occupancy(self) -> float:
+        return self._num_filled_slots / len(self._entries)
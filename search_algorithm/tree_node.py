@@ -13,6 +13,13 @@ class ScoredAction(NamedTuple):
     score: float
 
 
+class ActionStatistics(NamedTuple):
+    """Statistics of the playouts through an action, used by Monte Carlo searches."""
+
+    num_visits: int
+    value_sum: float
+
+
 class TreeNode(Registrable):
     def get_valid_actions(self) -> List[Action]:
         raise NotImplementedError
@@ -20,6 +27,16 @@ class TreeNode(Registrable):
     def get_next_node(self, action: Action) -> "TreeNode":
         raise NotImplementedError
 
+    def make_move(self, action: Action) -> Any:
+        """
+        Apply the action to this node in place and return a token to revert it with `unmake_move`.
+        Search algorithms use this to traverse the tree without allocating a new node for every move.
+        """
+        raise NotImplementedError
+
+    def unmake_move(self, undo_token: Any):
+        raise NotImplementedError
+
     @property
     def is_opponent_turn(self) -> bool:
         raise NotImplementedError
@@ -28,6 +45,11 @@ class TreeNode(Registrable):
     def is_terminal(self) -> bool:
         raise NotImplementedError
 
+    @property
+    def hash_key(self) -> int:
+        """Hash of the state of the node, used as the key of transposition tables."""
+        raise NotImplementedError
+
 
 class NodeEvaluator(Registrable):
     def __call__(self, node: TreeNode) -> float:
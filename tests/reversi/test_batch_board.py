@@ -0,0 +1,39 @@
+import numpy as np
+
+from reversi.board import Color
+from reversi.board.bit_board import BitBoard, BatchBitBoard
+
+
+def test_if_batch_board_matches_bit_board_over_random_games():
+    rng = np.random.default_rng(0)
+    batch_board = BatchBitBoard(16)
+
+    while not batch_board.is_terminal().all():
+        states = batch_board.to_states()
+        legal_masks = batch_board.get_legal_masks()
+        moves = batch_board.get_random_moves(rng)
+
+        expected_states = []
+        for state, legal_mask, move in zip(states, legal_masks, moves):
+            board = BitBoard.from_state(state)
+            assert board.get_legal_mask(state.color) == legal_mask
+            if move:
+                assert int(move) & int(legal_mask)
+                board.make_move_by_bits(int(move), state.color)
+            else:
+                assert legal_mask == 0
+            expected_states.append(board.to_state(state.color.opponent))
+
+        batch_board.make_moves(moves)
+        assert batch_board.to_states() == expected_states
+
+    for color in [Color.BLACK, Color.WHITE]:
+        expected_num_disks = [BitBoard.from_state(state).get_num_disks(color) for state in batch_board.to_states()]
+        assert batch_board.get_num_disks(color).tolist() == expected_num_disks
+
+
+def test_if_batch_board_converts_from_states():
+    state = BitBoard().to_state(Color.WHITE)
+    batch_board = BatchBitBoard.from_states([state, state])
+    assert batch_board.to_states() == [state, state]
+    assert batch_board.get_legal_masks().tolist() == [BitBoard().get_legal_mask(Color.WHITE)] * 2
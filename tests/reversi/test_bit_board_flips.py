@@ -0,0 +1,33 @@
+import random
+
+from reversi.board import Color
+from reversi.board.bit_board import BitBoard
+from reversi.board.bit_board.flips import get_reversed_places, get_reversed_places_by_shifting
+
+
+def test_if_table_driven_flips_match_shift_based_flips_over_random_games():
+    random.seed(0)
+    board = BitBoard()
+    for _ in range(20):
+        board.reset()
+        color = Color.BLACK
+        while True:
+            player_places = board.board[color]
+            opponent_places = board.board[color.opponent]
+            blank_places = ~(player_places | opponent_places) & 0xFFFFFFFFFFFFFFFF
+            for index in range(64):
+                position_bits = 1 << index
+                if not position_bits & blank_places:
+                    continue
+                assert get_reversed_places(player_places, opponent_places, index) == get_reversed_places_by_shifting(
+                    player_places, opponent_places, position_bits
+                )
+
+            legal_positions = board.get_legal_positions(color)
+            if len(legal_positions) == 0:
+                color = color.opponent
+                legal_positions = board.get_legal_positions(color)
+                if len(legal_positions) == 0:
+                    break
+            board.place(random.choice(legal_positions), color)
+            color = color.opponent
@@ -1,3 +1,5 @@
+import random
+
 import pytest
 from reversi.board import ReversiBoard, Color, Position
 from reversi.board.exceptions import InvalidPositionError
@@ -22,7 +24,12 @@ def list_board():
     return ReversiBoard.by_name("list")()
 
 
-@pytest.fixture(params=["list_board", "bit_board"])
+@pytest.fixture
+def array_board():
+    return ReversiBoard.by_name("array")()
+
+
+@pytest.fixture(params=["list_board", "bit_board", "array_board"])
 def board(request):
     return request.getfixturevalue(request.param)
 
@@ -107,3 +114,139 @@ def test_get_num_disks_after_place(board: ReversiBoard):
 
     assert board.get_num_disks(Color.WHITE) == 1
     assert board.get_num_disks(Color.BLACK) == 4
+
+
+def test_if_unmake_move_restores_board(board: ReversiBoard):
+    def get_colors():
+        return [[board.get_color(Position(x, y)) for y in range(board.size)] for x in range(board.size)]
+
+    initial_colors = get_colors()
+
+    undo_tokens = []
+    color = Color.BLACK
+    for _ in range(10):
+        legal_positions = board.get_legal_positions(color)
+        if len(legal_positions) == 0:
+            break
+        undo_tokens.append(board.make_move(legal_positions[0], color))
+        color = color.opponent
+
+    assert get_colors() != initial_colors
+
+    for undo_token in reversed(undo_tokens):
+        board.unmake_move(undo_token)
+
+    assert get_colors() == initial_colors
+
+
+def test_if_make_move_raises_invalid_position_error(board: ReversiBoard):
+    with pytest.raises(InvalidPositionError):
+        board.make_move(Position(0, 0), Color.BLACK)
+
+
+def test_if_bit_board_state_converts_back_to_same_board(bit_board: ReversiBoard):
+    bit_board.place(Position(3, 2), Color.BLACK)
+
+    state = bit_board.to_state(Color.WHITE)
+    assert state == bit_board.to_state(Color.WHITE)
+    assert state != bit_board.to_state(Color.BLACK)
+    assert {state: 1}[bit_board.to_state(Color.WHITE)] == 1
+
+    restored_board = type(bit_board).from_state(state)
+    for x in range(bit_board.size):
+        for y in range(bit_board.size):
+            assert restored_board.get_color(Position(x, y)) == bit_board.get_color(Position(x, y))
+
+
+def test_if_bit_board_iterates_legal_moves_as_bits(bit_board: ReversiBoard):
+    legal_moves = list(bit_board.iterate_legal_moves(Color.BLACK))
+
+    assert sum(legal_moves) == bit_board.get_legal_mask(Color.BLACK)
+    assert len(legal_moves) == len(bit_board.get_legal_positions(Color.BLACK))
+
+    bit_board.make_move_by_bits(legal_moves[0], Color.BLACK)
+    assert bit_board.get_num_disks(Color.BLACK) == 4
+    assert bit_board.get_num_disks(Color.WHITE) == 1
+
+
+def test_if_position_at_returns_shared_instance_equal_to_new_position():
+    assert Position.at(3, 4) is Position.at(3, 4)
+    assert Position.at(3, 4) == Position(3, 4)
+    assert hash(Position.at(3, 4)) == hash(Position(3, 4))
+    assert Position.from_index(Position(3, 4).to_index(8), 8) is Position.at(3, 4)
+    assert Position.at(-1, 4) == Position(-1, 4)
+
+
+def test_if_hash_key_is_updated_incrementally(board: ReversiBoard):
+    initial_hash_key = board.hash_key
+    assert board.get_hash_key(Color.BLACK) != board.get_hash_key(Color.WHITE)
+
+    undo_tokens = []
+    color = Color.BLACK
+    for _ in range(10):
+        legal_positions = board.get_legal_positions(color)
+        if len(legal_positions) == 0:
+            break
+        undo_tokens.append(board.make_move(legal_positions[-1], color))
+        assert board.hash_key == board._compute_hash_key()
+        assert board.hash_key != initial_hash_key
+        color = color.opponent
+
+    for undo_token in reversed(undo_tokens):
+        board.unmake_move(undo_token)
+    assert board.hash_key == initial_hash_key
+
+
+def test_if_hash_key_is_same_across_board_types(list_board: ReversiBoard, bit_board: ReversiBoard):
+    assert list_board.hash_key == bit_board.hash_key
+    for board in [list_board, bit_board]:
+        board.place(Position(3, 2), Color.BLACK)
+        board.place(Position(2, 2), Color.WHITE)
+    assert list_board.hash_key == bit_board.hash_key
+
+
+def test_if_list_board_plays_game_larger_than_16x16():
+    random.seed(0)
+    board = ReversiBoard.by_name("list")(size=18)
+
+    color = Color.BLACK
+    num_passes = 0
+    while num_passes < 2:
+        legal_positions = board.get_legal_positions(color)
+        if len(legal_positions) == 0:
+            num_passes += 1
+        else:
+            num_passes = 0
+            board.place(random.choice(legal_positions), color)
+            assert board.hash_key == board._compute_hash_key()
+        color = color.opponent
+    assert board.get_num_disks(Color.BLACK) + board.get_num_disks(Color.WHITE) > 16 * 16
+
+
+@pytest.mark.parametrize(
+    "board_name, size",
+    [["array", 6], ["array", 10], ["array", 18], ["bit", 4], ["bit", 6], ["bit", 10], ["bit", 16]],
+)
+def test_if_board_matches_list_board_on_other_sizes(board_name: str, size: int):
+    random.seed(size)
+    list_board = ReversiBoard.by_name("list")(size=size)
+    board = ReversiBoard.by_name(board_name)(size=size)
+
+    color = Color.BLACK
+    while True:
+        legal_positions = list_board.get_legal_positions(color)
+        assert set(board.get_legal_positions(color)) == set(legal_positions)
+        if len(legal_positions) == 0:
+            color = color.opponent
+            if len(list_board.get_legal_positions(color)) == 0:
+                break
+            continue
+
+        position = random.choice(legal_positions)
+        list_board.place(position, color)
+        board.place(position, color)
+        assert board.hash_key == list_board.hash_key
+        color = color.opponent
+
+    for color in [Color.BLACK, Color.WHITE]:
+        assert board.get_num_disks(color) == list_board.get_num_disks(color)
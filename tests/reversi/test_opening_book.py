@@ -0,0 +1,103 @@
+from typing import List
+import random
+
+from reversi.board import Color, Position
+from reversi.board.bit_board import BitBoard, BitBoardState
+from reversi.board.bit_board.symmetry import transform_bits
+from reversi.game_engine import ReversiGameEngine
+from reversi.ml.dataset_readers.wtb_file_parser import WthorHeader, WthorStructure
+from reversi.players.opening_book import OpeningBook, build_opening_book
+from reversi.players.search_players.node_evaluators.matrix_evaluators import ReversiManualEvaluator
+from reversi.players.search_players.search_player import MinMaxPlayer
+from search_algorithm.min_max_search import MinMaxSearch
+
+
+def _play_random_game(seed: int) -> List[Position]:
+    random.seed(seed)
+    game_engine = ReversiGameEngine(disable_logging=True)
+    game_engine.reset()
+    positions = []
+    while True:
+        position = random.choice(game_engine.board.get_legal_positions(game_engine.current_color))
+        positions.append(position)
+        if game_engine.execute_move(position):
+            return positions
+
+
+def _write_wtb_file(path: str, games: List[List[Position]]):
+    header = WthorHeader(num_games=len(games))
+    with open(path, "wb") as f:
+        f.write(bytes(header))
+        for positions in games:
+            board = BitBoard()
+            game_engine = ReversiGameEngine(board=board, disable_logging=True)
+            game_engine.reset()
+            for position in positions:
+                game_engine.execute_move(position)
+            game = WthorStructure(black_result=board.get_num_disks(Color.BLACK))
+            for i, position in enumerate(positions):
+                game.moves[i] = (position.x + 1) * 10 + (position.y + 1)
+            f.write(bytes(game))
+
+
+def _build_book(tmp_path, num_games: int, **kwargs) -> OpeningBook:
+    games = [_play_random_game(seed) for seed in range(num_games)]
+    _write_wtb_file(str(tmp_path / "games.wtb"), games)
+    build_opening_book([str(tmp_path / "games.wtb")], str(tmp_path / "book.bin"), max_num_moves=10)
+    return OpeningBook(str(tmp_path / "book.bin"), **kwargs)
+
+
+def test_if_book_contains_moves_of_games(tmp_path):
+    book = _build_book(tmp_path, num_games=20)
+
+    # the four first moves are symmetric
+    board = BitBoard()
+    book_moves = book.lookup(board, Color.BLACK)
+    assert len(book_moves) == 1
+    assert book_moves[0].num_games == 20
+    assert book_moves[0].position in board.get_legal_positions(Color.BLACK)
+
+    game_engine = ReversiGameEngine(board=board, disable_logging=True)
+    game_engine.reset()
+    for position in _play_random_game(seed=0)[:10]:
+        book_moves = book.lookup(board, game_engine.current_color)
+        assert all(move.position in board.get_legal_positions(game_engine.current_color) for move in book_moves)
+        if board.get_num_disks(Color.BLACK) + board.get_num_disks(Color.WHITE) > 5:
+            assert position in [move.position for move in book_moves]
+        game_engine.execute_move(position)
+    assert book.lookup(board, game_engine.current_color) == []
+    book.close()
+
+
+def test_if_book_finds_symmetric_positions(tmp_path):
+    book = _build_book(tmp_path, num_games=5)
+
+    board = BitBoard()
+    game_engine = ReversiGameEngine(board=board, disable_logging=True)
+    game_engine.reset()
+    for position in _play_random_game(seed=0)[:5]:
+        game_engine.execute_move(position)
+    color = game_engine.current_color
+    book_moves = book.lookup(board, color)
+
+    # rotate the board by 90 degrees
+    state = board.to_state(color)
+    rotated_state = BitBoardState(transform_bits(state.player, 1), transform_bits(state.opponent, 1), color)
+    rotated_board = BitBoard.from_state(rotated_state)
+    rotated_book_moves = book.lookup(rotated_board, color)
+    assert [move.num_games for move in rotated_book_moves] == [move.num_games for move in book_moves]
+    for move, rotated_move in zip(book_moves, rotated_book_moves):
+        assert rotated_board._position_to_bits(rotated_move.position) == transform_bits(
+            board._position_to_bits(move.position), 1
+        )
+    book.close()
+
+
+def test_if_player_plays_book_moves(tmp_path):
+    book = _build_book(tmp_path, num_games=5, min_num_games=5)
+    player = MinMaxPlayer(Color.BLACK, MinMaxSearch(ReversiManualEvaluator(), max_depth=1), opening_book=book)
+
+    board = BitBoard()
+    position = player.choose_position(board, board.get_legal_positions(Color.BLACK))
+    assert position == book.lookup(board, Color.BLACK)[0].position
+    book.close()
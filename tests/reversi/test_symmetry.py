@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from reversi.board import Color
+from reversi.board.bit_board import BitBoard
+from reversi.board.bit_board.symmetry import TRANSFORMS, INVERSE_TRANSFORMS, transform_bits, canonicalize
+
+
+def _transform_square(x: int, y: int, transform: int):
+    return [
+        (x, y),
+        (7 - y, x),
+        (7 - x, 7 - y),
+        (y, 7 - x),
+        (7 - x, y),
+        (x, 7 - y),
+        (y, x),
+        (7 - y, 7 - x),
+    ][transform]
+
+
+def _square_bits(x: int, y: int) -> int:
+    return 1 << (63 - (x * 8 + y))
+
+
+@pytest.mark.parametrize("transform", range(len(TRANSFORMS)))
+def test_if_transform_moves_each_square_correctly(transform: int):
+    for x in range(8):
+        for y in range(8):
+            assert transform_bits(_square_bits(x, y), transform) == _square_bits(*_transform_square(x, y, transform))
+
+
+@pytest.mark.parametrize("transform", range(len(TRANSFORMS)))
+def test_if_inverse_transform_restores_bits(transform: int):
+    random.seed(transform)
+    bits = random.getrandbits(64)
+    assert transform_bits(transform_bits(bits, transform), INVERSE_TRANSFORMS[transform]) == bits
+
+
+def test_if_first_moves_share_canonical_state():
+    canonical_states = set()
+    for move_bits in BitBoard().iterate_legal_moves(Color.BLACK):
+        board = BitBoard()
+        board.make_move_by_bits(move_bits, Color.BLACK)
+        state = board.to_state(Color.WHITE)
+
+        canonical_state, transform = canonicalize(state)
+        canonical_states.add(canonical_state)
+
+        assert transform_bits(canonical_state.player, INVERSE_TRANSFORMS[transform]) == state.player
+        assert transform_bits(canonical_state.opponent, INVERSE_TRANSFORMS[transform]) == state.opponent
+
+    assert len(canonical_states) == 1
@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from reversi.board import Color, Position
+from reversi.board.bit_board import BitBoard
+from reversi.board.list_board import ListBoard
+from reversi.players.search_players.search_player import ReversiSearchNode
+from reversi.players.search_players.endgame_solver import EndgameSolver, ReversiEndgameSearch
+from reversi.players.search_players.node_evaluators.matrix_evaluators import ReversiManualEvaluator
+from search_algorithm.min_max_search import MinMaxSearch, NodeEvaluator
+
+from .test_min_max_search import _play_random_moves
+
+
+class DiskDifferenceEvaluator(NodeEvaluator):
+    def __call__(self, node: ReversiSearchNode) -> float:
+        assert node.is_terminal
+        board = node.board
+        score = board.get_num_disks(node.playing_color) - board.get_num_disks(node.playing_color.opponent)
+        num_empties = board.size ** 2 - board.get_num_disks(Color.BLACK) - board.get_num_disks(Color.WHITE)
+        if score > 0:
+            return score + num_empties
+        if score < 0:
+            return score - num_empties
+        return 0
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_if_solver_returns_same_score_as_min_max_search(seed: int):
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=57, seed=seed)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+    if node.is_terminal:
+        return
+
+    expected_score = MinMaxSearch(DiskDifferenceEvaluator())._search_best_action_by_depth(node, max_depth=20).score
+
+    solver = EndgameSolver()
+    move, score = solver.solve(board.board[color], board.board[color.opponent])
+    assert score == expected_score
+
+    _, wld_score = solver.solve(board.board[color], board.board[color.opponent], alpha=-1, beta=1)
+    assert (wld_score > 0) == (score > 0) and (wld_score < 0) == (score < 0)
+
+
+@pytest.mark.parametrize("mode", ["exact", "wld"])
+def test_if_endgame_search_switches_by_number_of_empties(mode: str):
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=54, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    search = ReversiEndgameSearch(
+        search_algorithm=MinMaxSearch(ReversiManualEvaluator(), max_depth=2), max_num_empties=8, mode=mode
+    )
+    assert search.search_best_action(node) in node.get_valid_actions()
+    assert search.score is None
+
+    board_after_move = BitBoard()
+    color = _play_random_moves(board_after_move, num_disks=58, seed=0)
+    node = ReversiSearchNode(board_after_move, current_color=color, playing_color=color)
+    action = search.search_best_action(node)
+    assert search.score is not None
+    # the chosen move achieves the solved score
+    exact_search = MinMaxSearch(DiskDifferenceEvaluator())
+    score = exact_search.evaluate_move(action, node, current_depth=0, max_depth=20)
+    if mode == "exact":
+        assert score == search.score
+    else:
+        assert (score > 0) == (search.score > 0)
+
+
+def test_if_endgame_search_supports_other_boards():
+    bit_board = BitBoard()
+    color = _play_random_moves(bit_board, num_disks=58, seed=1)
+    list_board = ListBoard()
+    for x in range(8):
+        for y in range(8):
+            list_board._set_disk(Position.at(x, y), bit_board.get_color(Position.at(x, y)))
+
+    search = ReversiEndgameSearch()
+    search.search_best_action(ReversiSearchNode(bit_board, current_color=color, playing_color=color))
+    bit_board_score = search.score
+    search.search_best_action(ReversiSearchNode(list_board, current_color=color, playing_color=color))
+    assert search.score == bit_board_score
+
+
+def test_if_endgame_search_keeps_time_limit_of_fallback_search():
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=30, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    search_algorithm = MinMaxSearch(ReversiManualEvaluator(), max_time=10.0)
+    search = ReversiEndgameSearch(search_algorithm=search_algorithm, max_num_empties=64)
+    search.max_time = 0.2
+    assert search_algorithm.max_time == 0.2
+
+    # the solver runs out of time, and the fallback search only has the rest of it
+    start_time = time.perf_counter()
+    assert search.search_best_action(node) in node.get_valid_actions()
+    assert time.perf_counter() - start_time < 1.0
+    assert search._is_delegated
+    assert search_algorithm.max_time == 0.2
@@ -1,6 +1,12 @@
 from typing import List
+import random
+
 import pytest
 
+from reversi.board import Color
+from reversi.board.bit_board import BitBoard
+from reversi.players.search_players.search_player import ReversiSearchNode
+from reversi.players.search_players.node_evaluators.matrix_evaluators import ReversiManualEvaluator
 from search_algorithm.min_max_search import TreeNode, NodeEvaluator, MinMaxSearch
 
 
@@ -15,6 +21,15 @@ class FakeSearchNode(TreeNode):
     def get_next_node(self, action: int) -> "FakeSearchNode":
         return FakeSearchNode(self.state_value + action, is_opponent_turn=not self.is_opponent_turn)
 
+    def make_move(self, action: int) -> int:
+        self.state_value += action
+        self._is_opponent_turn = not self._is_opponent_turn
+        return action
+
+    def unmake_move(self, action: int):
+        self.state_value -= action
+        self._is_opponent_turn = not self._is_opponent_turn
+
     @property
     def is_opponent_turn(self) -> bool:
         return self._is_opponent_turn
@@ -23,9 +38,13 @@ class FakeSearchNode(TreeNode):
     def is_terminal(self) -> bool:
         return self.state_value == 3
 
+    @property
+    def hash_key(self) -> int:
+        return hash((self.state_value, self._is_opponent_turn))
+
 
 class FakeSearchNodeEvaluator(NodeEvaluator):
-    def evaluate(self, node: FakeSearchNode):
+    def __call__(self, node: FakeSearchNode):
         return node.state_value
 
 
@@ -59,3 +78,121 @@ def test_if_search_returns_best_action():
 
     current_node = FakeSearchNode(0, is_opponent_turn=False)
     assert min_max_search.search_best_action(current_node=current_node) == 1
+
+
+def test_if_search_root_action_tells_if_score_is_exact():
+    min_max_search = MinMaxSearch(node_evaluator=FakeSearchNodeEvaluator(), max_depth=3)
+    current_node = FakeSearchNode(0, is_opponent_turn=False)
+
+    result = min_max_search.search_root_action(current_node, action=1, max_depth=3, alpha=0)
+    assert result.is_exact and result.score == 1
+
+    # the action fails low, so the score is only an upper bound
+    result = min_max_search.search_root_action(current_node, action=0, max_depth=3, alpha=1)
+    assert not result.is_exact and result.score <= 1
+
+
+@pytest.mark.parametrize("max_depth", [1, 2, 3, 4, 5])
+def test_if_alpha_beta_returns_same_result_as_min_max_with_fewer_nodes(max_depth: int):
+    min_max_search = MinMaxSearch(node_evaluator=FakeSearchNodeEvaluator(), use_alpha_beta=False)
+    alpha_beta_search = MinMaxSearch(node_evaluator=FakeSearchNodeEvaluator(), use_alpha_beta=True)
+
+    min_max_result = min_max_search._search_best_action_by_depth(FakeSearchNode(-2, False), max_depth=max_depth)
+    alpha_beta_result = alpha_beta_search._search_best_action_by_depth(FakeSearchNode(-2, False), max_depth=max_depth)
+
+    assert alpha_beta_result == min_max_result
+    assert alpha_beta_search.num_searched_nodes <= min_max_search.num_searched_nodes
+    if max_depth > 2:
+        assert alpha_beta_search.num_searched_nodes < min_max_search.num_searched_nodes
+
+
+def _play_random_moves(board: BitBoard, num_disks: int, seed: int) -> Color:
+    random.seed(seed)
+    color = Color.BLACK
+    while board.get_num_disks(Color.BLACK) + board.get_num_disks(Color.WHITE) < num_disks:
+        legal_positions = board.get_legal_positions(color)
+        if len(legal_positions) == 0:
+            color = color.opponent
+            legal_positions = board.get_legal_positions(color)
+            if len(legal_positions) == 0:
+                break
+        board.place(random.choice(legal_positions), color)
+        color = color.opponent
+    return color
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_if_aspiration_window_does_not_change_scores(seed: int):
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=seed)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    search = MinMaxSearch(node_evaluator=ReversiManualEvaluator(), max_depth=4)
+    search_with_window = MinMaxSearch(node_evaluator=ReversiManualEvaluator(), max_depth=4, aspiration_window=1)
+    search.search_best_action(node)
+    search_with_window.search_best_action(node)
+
+    assert [iteration.depth for iteration in search_with_window.iterations] == [1, 2, 3, 4]
+    assert [iteration.score for iteration in search_with_window.iterations] == [
+        iteration.score for iteration in search.iterations
+    ]
+    num_searched_nodes = [iteration.num_searched_nodes for iteration in search_with_window.iterations]
+    assert num_searched_nodes == sorted(num_searched_nodes)
+
+
+def test_if_search_stops_when_reaching_end_of_game():
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=58, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+    num_empties = 64 - board.get_num_disks(Color.BLACK) - board.get_num_disks(Color.WHITE)
+
+    search = MinMaxSearch(node_evaluator=ReversiManualEvaluator())
+    search.search_best_action(node)
+    # each side can pass at most once per move of the other side
+    assert len(search.iterations) <= 2 * num_empties
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_if_search_with_transposition_table_stops_when_reaching_end_of_game(seed: int):
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=56, seed=seed)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+    num_empties = 64 - board.get_num_disks(Color.BLACK) - board.get_num_disks(Color.WHITE)
+
+    search = MinMaxSearch(node_evaluator=ReversiManualEvaluator(), transposition_table_size_mb=1)
+    search.search_best_action(node)
+    assert len(search.iterations) <= 2 * num_empties < search.max_depth
+
+
+def test_if_search_starts_from_previous_principal_variation():
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    search = MinMaxSearch(node_evaluator=ReversiManualEvaluator(), max_depth=4)
+    search.search_best_action(node)
+    principal_variation = search.principal_variation
+    for action in principal_variation[:2]:
+        node.make_move(action)
+
+    # no iteration is completed, so the principal variation is the one carried over from the previous search
+    search.max_depth = 0
+    search.search_best_action(node)
+    assert search.principal_variation == principal_variation[2:]
+
+
+def test_if_search_stops_within_node_budget():
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    search = MinMaxSearch(node_evaluator=ReversiManualEvaluator(), max_depth=4)
+    search.search_best_action(node)
+    # stop in the middle of the last iteration
+    max_num_nodes = search.iterations[-2].num_searched_nodes + 10
+    limited_search = MinMaxSearch(node_evaluator=ReversiManualEvaluator(), max_depth=4, max_num_nodes=max_num_nodes)
+    action = limited_search.search_best_action(node)
+
+    assert limited_search.num_searched_nodes == max_num_nodes
+    assert len(limited_search.iterations) == len(search.iterations) - 1
+    assert action in node.get_valid_actions()
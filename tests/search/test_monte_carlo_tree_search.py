@@ -0,0 +1,90 @@
+import pytest
+
+from reversi.board.bit_board import BitBoard
+from reversi.players.search_players.search_player import ReversiSearchNode
+from reversi.players.search_players.node_evaluators.win_lose_evaluator import WinLoseEvaluator
+from search_algorithm.min_max_search import MinMaxSearch
+from search_algorithm.monte_carlo_tree_search import MonteCarloTreeSearch
+
+from .test_min_max_search import _play_random_moves
+
+
+@pytest.mark.parametrize("selection", ["ucb1", "puct"])
+def test_if_mcts_builds_tree_and_restores_node(selection: str):
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+    hash_key = node.hash_key
+
+    search = MonteCarloTreeSearch(WinLoseEvaluator(), max_num_playouts=200, selection=selection, seed=0)
+    action = search.search_best_action(node)
+
+    assert node.hash_key == hash_key
+    assert action in node.get_valid_actions()
+    assert search.num_playouts == search.root.visit_count == 200
+    assert sum(child.visit_count for child in search.root.children) == 200
+    # the tree grows beyond the root
+    assert any(child.is_expanded and child.children for child in search.root.children)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_if_mcts_finds_winning_move_in_endgame(seed: int):
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=57, seed=seed)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+    if node.is_terminal:
+        return
+
+    # the search reaches the end of the game
+    exact_search = MinMaxSearch(WinLoseEvaluator())
+    if exact_search._search_best_action_by_depth(node, max_depth=20).score < 1:
+        return
+
+    search = MonteCarloTreeSearch(WinLoseEvaluator(), max_num_playouts=2000, seed=seed)
+    action = search.search_best_action(node)
+    assert exact_search.evaluate_move(action, node, current_depth=0, max_depth=20) == 1
+
+
+def test_if_mcts_rejects_unknown_selection():
+    with pytest.raises(ValueError):
+        MonteCarloTreeSearch(WinLoseEvaluator(), selection="unknown")
+
+
+@pytest.mark.parametrize("reuse_tree", [True, False])
+def test_if_mcts_reuses_subtree_of_played_moves(reuse_tree: bool):
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    search = MonteCarloTreeSearch(WinLoseEvaluator(), max_num_playouts=300, seed=0, reuse_tree=reuse_tree)
+    action = search.search_best_action(node)
+    reply_node = max(search.root.get_child(action).children, key=lambda child: child.visit_count)
+    num_reused_visits = reply_node.visit_count
+
+    node.make_move(action)
+    node.make_move(reply_node.action)
+    search.search_best_action(node)
+
+    if reuse_tree:
+        assert search.root is reply_node
+        assert search.root.visit_count == num_reused_visits + 300
+    else:
+        assert search.root.visit_count == 300
+
+
+class UnhashableSearchNode(ReversiSearchNode):
+    @property
+    def hash_key(self) -> int:
+        raise NotImplementedError
+
+
+def test_if_mcts_searches_nodes_without_hash_key():
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = UnhashableSearchNode(board, current_color=color, playing_color=color)
+
+    search = MonteCarloTreeSearch(WinLoseEvaluator(), max_num_playouts=100, seed=0)
+    for _ in range(2):
+        assert search.search_best_action(node) in node.get_valid_actions()
+        # the tree is not reused
+        assert search.root.visit_count == 100
@@ -0,0 +1,52 @@
+import pytest
+
+from search_algorithm.min_max_search import MinMaxSearch
+from search_algorithm.move_ordering import MoveOrdering, StaticMoveOrderer
+
+from .test_min_max_search import FakeSearchNode, FakeSearchNodeEvaluator
+
+
+class FakeStaticMoveOrderer(StaticMoveOrderer):
+    def __call__(self, node: FakeSearchNode, actions):
+        # the best moves for the side to move first
+        return sorted(actions, reverse=not node.is_opponent_turn)
+
+
+def test_if_move_ordering_puts_pv_hash_and_killer_moves_first():
+    move_ordering = MoveOrdering(use_history_heuristic=False)
+    node = FakeSearchNode(0, is_opponent_turn=False)
+
+    assert move_ordering.order(node, [-1, 0, 1], ply=1) == [-1, 0, 1]
+    assert move_ordering.order(node, [-1, 0, 1], ply=1, pv_action=1, hash_action=0) == [1, 0, -1]
+
+    move_ordering.update_by_cutoff(node, 0, ply=1, depth=2)
+    assert move_ordering.order(node, [-1, 0, 1], ply=1) == [0, -1, 1]
+    assert move_ordering.order(node, [-1, 0, 1], ply=2) == [-1, 0, 1]
+
+
+def test_if_move_ordering_sorts_by_history():
+    move_ordering = MoveOrdering(use_killer_moves=False)
+    node = FakeSearchNode(0, is_opponent_turn=False)
+
+    move_ordering.update_by_cutoff(node, 1, ply=1, depth=1)
+    move_ordering.update_by_cutoff(node, 0, ply=1, depth=2)
+    assert move_ordering.order(node, [-1, 0, 1], ply=3) == [0, 1, -1]
+    # the history is kept for each side
+    assert move_ordering.order(FakeSearchNode(0, is_opponent_turn=True), [-1, 0, 1], ply=3) == [-1, 0, 1]
+
+
+@pytest.mark.parametrize("max_depth", [3, 4, 5])
+def test_if_move_ordering_keeps_result_and_reduces_searched_nodes(max_depth: int):
+    search = MinMaxSearch(node_evaluator=FakeSearchNodeEvaluator(), max_depth=max_depth)
+    search_with_ordering = MinMaxSearch(
+        node_evaluator=FakeSearchNodeEvaluator(),
+        max_depth=max_depth,
+        move_ordering=MoveOrdering(static_move_orderer=FakeStaticMoveOrderer()),
+    )
+
+    assert search_with_ordering.search_best_action(FakeSearchNode(-2, False)) == search.search_best_action(
+        FakeSearchNode(-2, False)
+    )
+    assert search_with_ordering.num_searched_nodes < search.num_searched_nodes
+    assert search_with_ordering.principal_variation[0] == 1
+    assert len(search_with_ordering.principal_variation) == max_depth
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+import torch
+
+from my_ml.model import Model
+from registrable import import_submodules
+from reversi.board.bit_board import BitBoard
+from reversi.players.ml_player.neural_monte_carlo_tree_search import NeuralMonteCarloTreeSearch
+from reversi.players.search_players.search_player import ReversiSearchNode
+from reversi.players.search_players.node_evaluators.win_lose_evaluator import WinLoseEvaluator
+
+from .test_min_max_search import _play_random_moves
+
+
+@pytest.fixture
+def serialization_dir(tmp_path):
+    # register the feature extractors and the model modules
+    import_submodules("reversi")
+    torch.manual_seed(0)
+    config = {
+        "reader": {"type": "reversi_move_prediction", "feature_extractor": {"type": "cnn"}},
+        "model": {"type": "move_predictor", "board_encoder": {"type": "reversi_conv", "num_channels": [2, 8]}},
+    }
+    json.dump(config, open(tmp_path / "config.json", "w"))
+    torch.save(Model.from_params(config["model"]).state_dict(), tmp_path / "best.th")
+    return str(tmp_path)
+
+
+def test_if_priors_are_distribution_over_valid_actions(serialization_dir: str):
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    search = NeuralMonteCarloTreeSearch(serialization_dir, WinLoseEvaluator())
+    priors = search.get_priors(node, node.get_valid_actions())
+    assert len(priors) == len(node.get_valid_actions())
+    assert sum(priors) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("batch_size", [1, 8])
+def test_if_batched_search_evaluates_leaves_together(serialization_dir: str, batch_size: int):
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+    hash_key = node.hash_key
+
+    search = NeuralMonteCarloTreeSearch(
+        serialization_dir, WinLoseEvaluator(), max_num_playouts=100, batch_size=batch_size, max_batch_wait=1.0, seed=0
+    )
+    action = search.search_best_action(node)
+
+    assert node.hash_key == hash_key
+    assert action in node.get_valid_actions()
+    # the virtual losses are all removed
+    assert search.num_playouts == search.root.visit_count == 100
+    assert sum(child.visit_count for child in search.root.children) == 100
+    assert all(child.value_sum >= -child.visit_count for child in search.root.children)
+    if batch_size == 1:
+        assert search.num_forward_passes == 101
+    else:
+        assert search.num_forward_passes < 100 / 2
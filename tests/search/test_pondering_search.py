@@ -0,0 +1,59 @@
+import time
+
+from reversi.board.bit_board import BitBoard
+from reversi.players.search_players.search_player import ReversiSearchNode
+from reversi.players.search_players.node_evaluators.matrix_evaluators import ReversiManualEvaluator
+from search_algorithm.min_max_search import MinMaxSearch
+from search_algorithm.pondering_search import PonderingSearch
+
+from .test_min_max_search import _play_random_moves
+
+
+def _build_search() -> MinMaxSearch:
+    return MinMaxSearch(node_evaluator=ReversiManualEvaluator(), max_depth=3, transposition_table_size_mb=1)
+
+
+def test_if_pondering_search_reuses_results_on_ponder_hit():
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    pondering_search = PonderingSearch(_build_search())
+    try:
+        action = pondering_search.search_best_action(node)
+        principal_variation = pondering_search.principal_variation
+        assert principal_variation[0] == action
+        for a in principal_variation[:2]:
+            node.make_move(a)
+        # the opponent thinks
+        time.sleep(0.5)
+
+        serial_search = _build_search()
+        serial_search.search_best_action(node)
+        pondering_search.search_best_action(node)
+        assert pondering_search.num_ponder_hits == 1
+        assert len(pondering_search.ponder_iterations) == 3
+        # shallower iterations may get the deeper scores from the transposition table
+        assert pondering_search.iterations[-1].score == serial_search.iterations[-1].score
+        assert pondering_search.num_searched_nodes < serial_search.num_searched_nodes
+    finally:
+        pondering_search.close()
+
+
+def test_if_pondering_search_works_on_ponder_miss():
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    pondering_search = PonderingSearch(_build_search())
+    try:
+        pondering_search.search_best_action(node)
+        node.make_move(pondering_search.principal_variation[0])
+        expected_reply = pondering_search.principal_variation[1]
+        node.make_move(next(a for a in node.get_valid_actions() if a != expected_reply))
+
+        assert pondering_search.search_best_action(node) in node.get_valid_actions()
+        assert pondering_search.num_ponder_hits == 0
+        assert pondering_search.ponder_iterations == []
+    finally:
+        pondering_search.close()
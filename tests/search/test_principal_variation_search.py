@@ -0,0 +1,45 @@
+import pytest
+
+from reversi.board.bit_board import BitBoard
+from reversi.players.search_players.search_player import ReversiSearchNode
+from reversi.players.search_players.node_evaluators.matrix_evaluators import ReversiManualEvaluator
+from reversi.players.search_players.move_orderers.static_move_orderer import ReversiStaticMoveOrderer
+from search_algorithm.min_max_search import MinMaxSearch
+from search_algorithm.move_ordering import MoveOrdering
+from search_algorithm.principal_variation_search import PrincipalVariationSearch
+
+from .test_min_max_search import FakeSearchNode, FakeSearchNodeEvaluator, _play_random_moves
+
+
+@pytest.mark.parametrize("max_depth", [1, 2, 3, 4, 5])
+def test_if_pvs_returns_same_score_as_alpha_beta(max_depth: int):
+    alpha_beta_search = MinMaxSearch(node_evaluator=FakeSearchNodeEvaluator())
+    pvs = PrincipalVariationSearch(node_evaluator=FakeSearchNodeEvaluator(), null_window_width=1)
+
+    alpha_beta_result = alpha_beta_search._search_best_action_by_depth(FakeSearchNode(-2, False), max_depth=max_depth)
+    pvs_result = pvs._search_best_action_by_depth(FakeSearchNode(-2, False), max_depth=max_depth)
+
+    assert pvs_result.score == alpha_beta_result.score
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_if_pvs_returns_same_scores_as_alpha_beta_on_reversi(seed: int):
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=seed)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    def build_move_ordering():
+        return MoveOrdering(static_move_orderer=ReversiStaticMoveOrderer())
+
+    alpha_beta_search = MinMaxSearch(
+        node_evaluator=ReversiManualEvaluator(), max_depth=5, move_ordering=build_move_ordering()
+    )
+    pvs = PrincipalVariationSearch(
+        node_evaluator=ReversiManualEvaluator(), max_depth=5, move_ordering=build_move_ordering(), null_window_width=1
+    )
+    alpha_beta_search.search_best_action(node)
+    pvs.search_best_action(node)
+
+    assert [iteration.score for iteration in pvs.iterations] == [
+        iteration.score for iteration in alpha_beta_search.iterations
+    ]
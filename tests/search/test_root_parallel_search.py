@@ -0,0 +1,47 @@
+import pytest
+
+from reversi.board.bit_board import BitBoard
+from reversi.players.search_players.search_player import ReversiSearchNode
+from reversi.players.search_players.node_evaluators.win_lose_evaluator import WinLoseEvaluator
+from search_algorithm.monte_carlo_search import MonteCarloSearch
+from search_algorithm.monte_carlo_tree_search import MonteCarloTreeSearch
+from search_algorithm.root_parallel_search import RootParallelSearch
+
+from .test_min_max_search import _play_random_moves
+
+
+@pytest.mark.parametrize("search_algorithm_class", [MonteCarloSearch, MonteCarloTreeSearch])
+def test_if_root_parallel_search_merges_statistics_of_workers(search_algorithm_class):
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    search = RootParallelSearch(search_algorithm_class(WinLoseEvaluator(), max_num_playouts=100), num_workers=2)
+    try:
+        statistics = search.search_root_statistics(node)
+        assert set(statistics) == set(node.get_valid_actions())
+        assert sum(statistic.num_visits for statistic in statistics.values()) == search.num_playouts == 100
+
+        # the workers are reused
+        processes = list(search._processes)
+        assert search.search_best_action(node) in node.get_valid_actions()
+        assert search._processes == processes
+        # the visits reused from the first search are not counted as playouts
+        assert search.num_playouts == 100
+    finally:
+        search.close()
+
+
+def test_if_root_parallel_search_honors_max_time():
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    search = RootParallelSearch(
+        MonteCarloSearch(WinLoseEvaluator(), max_time=0.2, max_num_playouts=10 ** 9), num_workers=2
+    )
+    try:
+        search.search_best_action(node)
+        assert 0 < search.num_playouts < 10 ** 9
+    finally:
+        search.close()
@@ -0,0 +1,45 @@
+from reversi.board.bit_board import BitBoard
+from reversi.players.search_players.search_player import ReversiSearchNode
+from reversi.players.search_players.node_evaluators.matrix_evaluators import ReversiManualEvaluator
+from search_algorithm.min_max_search import MinMaxSearch
+from search_algorithm.root_splitting_search import RootSplittingSearch
+
+from .test_min_max_search import _play_random_moves
+
+
+def test_if_root_splitting_search_returns_same_scores_as_serial_search():
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    serial_search = MinMaxSearch(node_evaluator=ReversiManualEvaluator(), max_depth=3)
+    parallel_search = RootSplittingSearch(
+        MinMaxSearch(node_evaluator=ReversiManualEvaluator(), max_depth=3), num_workers=2
+    )
+    try:
+        serial_search.search_best_action(node)
+        # the second search runs on the same workers
+        for _ in range(2):
+            action = parallel_search.search_best_action(node)
+            assert [iteration.score for iteration in parallel_search.iterations] == [
+                iteration.score for iteration in serial_search.iterations
+            ]
+            assert parallel_search.principal_variation[0] == action
+            assert len(parallel_search.principal_variation) == 3
+    finally:
+        parallel_search.close()
+
+
+def test_if_root_splitting_search_honors_max_time():
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+
+    parallel_search = RootSplittingSearch(
+        MinMaxSearch(node_evaluator=ReversiManualEvaluator(), max_time=0.2), num_workers=2
+    )
+    try:
+        assert parallel_search.search_best_action(node) in node.get_valid_actions()
+        assert 0 < len(parallel_search.iterations) < 100
+    finally:
+        parallel_search.close()
@@ -0,0 +1,42 @@
+import pytest
+
+from search_algorithm.search_budget import SearchBudget, SearchBudgetExhausted, TimeManager
+
+
+def test_if_node_budget_is_exhausted_at_max_num_nodes():
+    budget = SearchBudget(max_num_nodes=100)
+    num_nodes = 0
+    while not budget.is_exhausted(num_nodes):
+        num_nodes += 1
+    assert num_nodes == 100
+
+
+def test_if_time_budget_checks_clock_occasionally():
+    budget = SearchBudget(max_time=0.05)
+    num_nodes = 0
+    num_checks = 0
+    with pytest.raises(SearchBudgetExhausted):
+        while True:
+            num_nodes += 1
+            if num_nodes >= budget.next_check_num_nodes:
+                num_checks += 1
+                budget.check(num_nodes)
+    assert budget.elapsed_time >= 0.05
+    assert num_checks < num_nodes / 10
+
+
+def test_if_unlimited_budget_is_never_exhausted():
+    budget = SearchBudget()
+    assert not budget.is_exhausted(1)
+    assert budget.next_check_num_nodes == float("inf")
+
+
+def test_if_time_manager_splits_remaining_time():
+    time_manager = TimeManager(total_time=10.0, safety_margin=0.0)
+    assert time_manager.allocate(10) == pytest.approx(1.0)
+    time_manager.consume(5.0)
+    assert time_manager.allocate(5) == pytest.approx(1.0)
+    time_manager.consume(10.0)
+    assert time_manager.allocate(5) == time_manager.min_time_per_move
+    time_manager.reset()
+    assert time_manager.remaining_time == 10.0
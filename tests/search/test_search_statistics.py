@@ -0,0 +1,61 @@
+import json
+
+from reversi.board.bit_board import BitBoard
+from reversi.players.search_players.search_player import ReversiSearchNode
+from reversi.players.search_players.node_evaluators.matrix_evaluators import ReversiManualEvaluator
+from reversi.players.search_players.node_evaluators.win_lose_evaluator import WinLoseEvaluator
+from search_algorithm.min_max_search import MinMaxSearch
+from search_algorithm.monte_carlo_tree_search import MonteCarloTreeSearch
+from search_algorithm.search_statistics import JsonLinesStatisticsWriter, SearchIteration, SearchStatistics
+
+from .test_min_max_search import _play_random_moves
+
+
+def _get_node() -> ReversiSearchNode:
+    board = BitBoard()
+    color = _play_random_moves(board, num_disks=20, seed=0)
+    return ReversiSearchNode(board, current_color=color, playing_color=color)
+
+
+def test_if_min_max_search_returns_statistics():
+    node = _get_node()
+    search = MinMaxSearch(ReversiManualEvaluator(), max_depth=3, transposition_table_size_mb=1)
+    action, statistics = search.search(node)
+
+    assert action == search.principal_variation[0]
+    assert statistics.num_searched_nodes == search.num_searched_nodes
+    assert 0 < statistics.num_leaf_evaluations < statistics.num_searched_nodes
+    assert statistics.num_cutoffs > 0
+    assert 0 < statistics.num_transposition_table_hits <= statistics.num_transposition_table_probes
+    assert [iteration.depth for iteration in statistics.iterations] == [1, 2, 3]
+    assert statistics.effective_branching_factor > 1
+    assert statistics.nodes_per_second > 0
+
+    _, statistics = MinMaxSearch(ReversiManualEvaluator(), max_depth=3, use_alpha_beta=False).search(node)
+    assert statistics.num_cutoffs == 0
+
+
+def test_if_mcts_returns_statistics():
+    _, statistics = MonteCarloTreeSearch(WinLoseEvaluator(), max_num_playouts=50, seed=0).search(_get_node())
+    assert statistics.num_playouts == statistics.num_leaf_evaluations == 50
+    assert statistics.playouts_per_second > 0
+
+
+def test_if_effective_branching_factor_is_ratio_of_last_iterations():
+    iterations = [SearchIteration(depth, 0, None, num_nodes, 0.0) for depth, num_nodes in [(1, 10), (2, 40), (3, 130)]]
+    assert SearchStatistics(1.0, iterations=tuple(iterations)).effective_branching_factor == 3.0
+    assert SearchStatistics(1.0, iterations=tuple(iterations[:2])).effective_branching_factor == 3.0
+    assert SearchStatistics(1.0, iterations=tuple(iterations[:1])).effective_branching_factor is None
+
+
+def test_if_statistics_are_written_as_json_lines(tmp_path):
+    _, statistics = MinMaxSearch(ReversiManualEvaluator(), max_depth=2).search(_get_node())
+    writer = JsonLinesStatisticsWriter(str(tmp_path / "statistics.jsonl"))
+    writer.write(statistics, game=0)
+    writer.write(statistics, game=1)
+    writer.close()
+
+    records = [json.loads(line) for line in open(tmp_path / "statistics.jsonl")]
+    assert [record["game"] for record in records] == [0, 1]
+    assert records[0]["num_searched_nodes"] == statistics.num_searched_nodes
+    assert len(records[0]["iterations"]) == 2
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from reversi.board import Color
+from reversi.board.bit_board import BitBoard
+from reversi.players.search_players.search_player import ReversiSearchNode
+from reversi.players.search_players.node_evaluators.win_lose_evaluator import WinLoseEvaluator
+from search_algorithm.min_max_search import MinMaxSearch
+from search_algorithm.transposition_table import TranspositionTable, Bound
+
+from .test_min_max_search import FakeSearchNode, FakeSearchNodeEvaluator
+
+
+def test_if_transposition_table_returns_stored_entry():
+    table = TranspositionTable(size_mb=0.01)
+    table.store(hash_key=12345, depth=3, bound=Bound.EXACT, score=1.0, best_action="a")
+
+    entry = table.probe(12345)
+    assert (entry.depth, entry.bound, entry.score, entry.best_action) == (3, Bound.EXACT, 1.0, "a")
+    assert table.probe(54321) is None
+    assert table.hit_rate == 0.5
+
+
+def test_if_transposition_table_keeps_deeper_entry_and_latest_entry():
+    table = TranspositionTable(size_mb=0.001)
+    num_buckets = table.num_buckets
+
+    # three different positions in the same bucket
+    table.store(hash_key=1, depth=5, bound=Bound.EXACT, score=1.0, best_action=None)
+    table.store(hash_key=1 + num_buckets, depth=2, bound=Bound.EXACT, score=2.0, best_action=None)
+    table.store(hash_key=1 + 2 * num_buckets, depth=1, bound=Bound.EXACT, score=3.0, best_action=None)
+
+    assert table.probe(1).score == 1.0
+    assert table.probe(1 + num_buckets) is None
+    assert table.probe(1 + 2 * num_buckets).score == 3.0
+
+    # the entries of older searches are replaced regardless of the depth
+    table.new_search()
+    table.store(hash_key=1 + num_buckets, depth=2, bound=Bound.EXACT, score=2.0, best_action=None)
+    assert table.probe(1 + num_buckets).score == 2.0
+    assert table.probe(1).score == 1.0
+
+
+def test_if_transposition_table_respects_memory_budget():
+    table = TranspositionTable(size_mb=0.01)
+    for hash_key in range(10000):
+        table.store(hash_key=hash_key, depth=0, bound=Bound.EXACT, score=0.0, best_action=None)
+    assert table.occupancy == 1.0
+    assert len(table._entries) == 2 * table.num_buckets < 10000
+
+
+@pytest.mark.parametrize("max_depth", [3, 4, 5])
+def test_if_transposition_table_reduces_searched_nodes(max_depth: int):
+    search = MinMaxSearch(node_evaluator=FakeSearchNodeEvaluator(), max_depth=max_depth)
+    search_with_table = MinMaxSearch(
+        node_evaluator=FakeSearchNodeEvaluator(), max_depth=max_depth, transposition_table_size_mb=1
+    )
+
+    search.search_best_action(FakeSearchNode(-2, False))
+    search_with_table.search_best_action(FakeSearchNode(-2, False))
+
+    assert search_with_table.num_searched_nodes < search.num_searched_nodes
+    assert search_with_table.transposition_table.hit_rate > 0
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_if_transposition_table_does_not_change_exact_endgame_result(seed: int):
+    random.seed(seed)
+    board = BitBoard()
+    color = Color.BLACK
+    while board.get_num_disks(Color.BLACK) + board.get_num_disks(Color.WHITE) < 58:
+        legal_positions = board.get_legal_positions(color)
+        if len(legal_positions) == 0:
+            color = color.opponent
+            legal_positions = board.get_legal_positions(color)
+            if len(legal_positions) == 0:
+                break
+        board.place(random.choice(legal_positions), color)
+        color = color.opponent
+
+    # the search reaches the end of the game even with passes in between,
+    # so the results do not depend on the depth of the stored results
+    search = MinMaxSearch(node_evaluator=WinLoseEvaluator())
+    search_with_table = MinMaxSearch(node_evaluator=WinLoseEvaluator(), transposition_table_size_mb=1)
+    node = ReversiSearchNode(board, current_color=color, playing_color=color)
+    if node.is_terminal:
+        return
+
+    for max_depth in [12, 13]:
+        assert search_with_table._search_best_action_by_depth(node, max_depth) == search._search_best_action_by_depth(
+            node, max_depth
+        )